@@ -32,6 +32,8 @@ class Settings(BaseSettings):
     COMMISSION_RATE: float = 0.001  # 0.1%
     SLIPPAGE_RATE: float = 0.0005   # 0.05%
     RISK_FREE_RATE: float = 0.02     # 2% annual
+    OPTIMIZER_WORKERS: int = 1  # workers for parameter sweeps; 1 = serial (default), 0 = all cores
+    OPTIMIZER_EXECUTOR: str = "process"  # "thread" shares memory when numba releases the GIL
     
     # Logging Settings
     LOG_LEVEL: str = "INFO"
@@ -43,7 +45,9 @@ class Settings(BaseSettings):
     # Storage settings
     DEFAULT_STORAGE_BACKEND: str = "local"  # memory | local | s3 | gcs | azure
     LOCAL_STORAGE_BASE: str = "backend/data/tmp_store"
-    LOCAL_STORAGE_CODEC: str = "snappy"  # snappy | zstd
+    LOCAL_STORAGE_CODEC: str = "zstd"  # zstd | snappy
+    LOCAL_STORAGE_CODEC_LEVEL: int | None = 3  # zstd level; ignored by codecs without levels
+    LOCAL_STORAGE_CACHE_BYTES: int = 256 * 1024 * 1024  # decoded frames kept by the local backend; 0 disables
 
     # S3 settings
     S3_ENABLED: bool = False
@@ -52,6 +56,8 @@ class Settings(BaseSettings):
     S3_REGION: str = "us-east-1"
     S3_SSE: str | None = None  # e.g., "AES256" or "aws:kms"
     S3_KMS_KEY_ID: str | None = None
+    S3_PARQUET_CODEC: str = "zstd"  # zstd | snappy; snappy if pyarrow lacks the codec
+    S3_PARQUET_CODEC_LEVEL: int | None = 3  # zstd level; ignored by codecs without levels
 
     # GCS settings
     GCS_ENABLED: bool = False
@@ -8,6 +8,8 @@ from fastapi.responses import JSONResponse
 import logging
 from contextlib import asynccontextmanager
 
+import pandas as pd
+
 from app.core.config import get_settings
 from app.core.logging import setup_logging
 from app.core.database import init_db
@@ -21,6 +23,10 @@ from app.utils.exceptions import StrategyLabException
 logger = setup_logging()
 settings = get_settings()
 
+# pandas Copy-on-Write for the whole process, set once before any request is
+# served; lets the memory storage backend hand out shallow copies
+pd.set_option("mode.copy_on_write", True)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -0,0 +1,21 @@
+"""
+Optional Numba JIT support
+
+Kernels decorated with ``njit`` are compiled when numba is installed and run
+as plain Python otherwise; ``prange`` falls back to ``range``. Callers check ``NUMBA_AVAILABLE`` to pick a
+vectorized pandas/numpy path instead of an interpreted loop when numba is
+missing.
+"""
+try:
+    from numba import njit, prange  # type: ignore
+
+    NUMBA_AVAILABLE = True
+except Exception:  # pragma: no cover - numba is optional
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit supporting both decorator forms"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
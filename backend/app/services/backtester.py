@@ -8,15 +8,101 @@ from typing import Dict, Optional, List, Tuple
 import logging
 from datetime import datetime
 
+from app.services._njit import NUMBA_AVAILABLE, njit
 from app.services.indicators import TechnicalIndicators
 from app.services.metrics import PerformanceMetrics
-from app.utils.exceptions import BacktestError, InvalidStrategyError, InsufficientDataError
+from app.utils.exceptions import BacktestError, BacktestPruned, InvalidStrategyError, InsufficientDataError
 from app.core.config import get_settings
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
 
+@njit(cache=True, nogil=True)
+def _hold_positions(entry: np.ndarray, exit: np.ndarray) -> np.ndarray:
+    """Long/flat position per bar: enter on entry when flat, leave on exit when long"""
+    positions = np.zeros(entry.shape[0], dtype=np.int8)
+    position = 0
+    for i in range(entry.shape[0]):
+        if entry[i] and position == 0:
+            position = 1
+        elif exit[i] and position == 1:
+            position = 0
+        positions[i] = position
+    return positions
+
+
+@njit(cache=True, nogil=True)
+def _trade_bounds(position_change: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Bar indices of each completed trade's entry and exit"""
+    entries = np.empty(position_change.shape[0], dtype=np.int64)
+    exits = np.empty(position_change.shape[0], dtype=np.int64)
+    count = 0
+    in_position = False
+    for i in range(position_change.shape[0]):
+        if position_change[i] == 1 and not in_position:
+            in_position = True
+            entries[count] = i
+        elif position_change[i] == -1 and in_position:
+            exits[count] = i
+            count += 1
+            in_position = False
+    return entries[:count], exits[:count]
+
+
+@njit(cache=True, nogil=True)
+def _crossings(a: np.ndarray, b: np.ndarray, upward: bool) -> np.ndarray:
+    """Bars where ``a`` moves above ``b`` (or below it when not ``upward``)"""
+    out = np.zeros(a.shape[0], dtype=np.bool_)
+    for i in range(1, a.shape[0]):
+        if upward:
+            out[i] = a[i] > b[i] and a[i - 1] <= b[i - 1]
+        else:
+            out[i] = a[i] < b[i] and a[i - 1] >= b[i - 1]
+    return out
+
+
+def _crossing(a, b, upward: bool) -> pd.Series:
+    if not isinstance(a, pd.Series) and not isinstance(b, pd.Series):
+        raise TypeError("cross_over/cross_under need at least one Series argument")
+    if isinstance(a, pd.Series) and isinstance(b, pd.Series) and not a.index.equals(b.index):
+        # Differently labeled Series keep pandas' semantics (and errors)
+        if upward:
+            return (a > b) & (a.shift(1) <= b.shift(1))
+        return (a < b) & (a.shift(1) >= b.shift(1))
+    index = a.index if isinstance(a, pd.Series) else b.index
+    a = np.broadcast_to(np.asarray(a, dtype=np.float64), len(index))
+    b = np.broadcast_to(np.asarray(b, dtype=np.float64), len(index))
+    if NUMBA_AVAILABLE:
+        return pd.Series(_crossings(np.ascontiguousarray(a), np.ascontiguousarray(b), upward), index=index)
+    out = np.zeros(len(index), dtype=bool)
+    if upward:
+        out[1:] = (a[1:] > b[1:]) & (a[:-1] <= b[:-1])
+    else:
+        out[1:] = (a[1:] < b[1:]) & (a[:-1] >= b[:-1])
+    return pd.Series(out, index=index)
+
+
+def cross_over(a, b) -> pd.Series:
+    """
+    Condition helper: ``a`` closes above ``b`` after being at or below it
+    
+    Same result as ``(a > b) & (a.shift(1) <= b.shift(1))`` in one pass;
+    either side may be a number, but not both.
+    """
+    return _crossing(a, b, True)
+
+
+def cross_under(a, b) -> pd.Series:
+    """
+    Condition helper: ``a`` closes below ``b`` after being at or above it
+    
+    Same result as ``(a < b) & (a.shift(1) >= b.shift(1))`` in one pass;
+    either side may be a number, but not both.
+    """
+    return _crossing(a, b, False)
+
+
 class VectorizedBacktester:
     """
     Vectorized backtesting engine for trading strategies
@@ -34,7 +120,8 @@ class VectorizedBacktester:
         data: pd.DataFrame,
         initial_capital: float = 100000.0,
         commission_rate: float = 0.001,
-        slippage_rate: float = 0.0005
+        slippage_rate: float = 0.0005,
+        copy_data: bool = True
     ):
         """
         Initialize backtester
@@ -44,8 +131,10 @@ class VectorizedBacktester:
             initial_capital: Starting capital
             commission_rate: Commission per trade (default: 0.1%)
             slippage_rate: Slippage per trade (default: 0.05%)
+            copy_data: Copy ``data`` on construction (default: True); pass
+                False when the caller guarantees it is not mutated meanwhile
         """
-        self.data = data.copy()
+        self.data = data.copy() if copy_data else data
         self.initial_capital = initial_capital
         self.commission_rate = commission_rate
         self.slippage_rate = slippage_rate
@@ -75,6 +164,8 @@ class VectorizedBacktester:
             eval_namespace = {col: data[col] for col in data.columns}
             eval_namespace['np'] = np
             eval_namespace['abs'] = abs
+            eval_namespace['cross_over'] = cross_over
+            eval_namespace['cross_under'] = cross_under
             
             # Evaluate condition
             result = eval(condition_str, {"__builtins__": {}}, eval_namespace)
@@ -112,23 +203,16 @@ class VectorizedBacktester:
         exit_signal = self._evaluate_condition(exit_condition, df)
         
         # Generate signals (1 = long, 0 = flat)
-        df['Entry_Signal'] = entry_signal.astype(int)
-        df['Exit_Signal'] = exit_signal.astype(int)
-        
-        # Generate position (maintain position until exit)
-        df['Signal'] = 0
-        position = 0
-        
-        signals = []
-        for i in range(len(df)):
-            if df['Entry_Signal'].iloc[i] == 1 and position == 0:
-                position = 1  # Enter long
-            elif df['Exit_Signal'].iloc[i] == 1 and position == 1:
-                position = 0  # Exit position
-            
-            signals.append(position)
+        # Signals and positions only take -1, 0 and 1, so int8 suffices
+        df['Entry_Signal'] = entry_signal.astype(np.int8)
+        df['Exit_Signal'] = exit_signal.astype(np.int8)
         
-        df['Signal'] = signals
+        # Generate position (maintain position until exit); compiled once and
+        # reused by every backtest, e.g. across an optimizer sweep
+        df['Signal'] = _hold_positions(
+            df['Entry_Signal'].to_numpy() == 1,
+            df['Exit_Signal'].to_numpy() == 1
+        )
         
         return df
     
@@ -181,50 +265,37 @@ class VectorizedBacktester:
             List of trade dictionaries
         """
         trades = []
-        in_position = False
-        entry_idx = None
-        entry_price = None
+        close = data['Close'].to_numpy()
+        entries, exits = _trade_bounds(data['Position_Change'].to_numpy(dtype=np.float64))
         
-        for idx in range(len(data)):
-            position = data['Signal'].iloc[idx]
-            position_change = data['Position_Change'].iloc[idx]
-            
-            # Entry
-            if position_change == 1 and not in_position:
-                in_position = True
-                entry_idx = idx
-                entry_price = data['Close'].iloc[idx]
-            
-            # Exit
-            elif position_change == -1 and in_position:
-                exit_idx = idx
-                exit_price = data['Close'].iloc[idx]
-                
-                # Calculate trade return
-                trade_return = (exit_price - entry_price) / entry_price
-                
-                # Apply costs
-                trade_return -= (self.commission_rate + self.slippage_rate) * 2  # Entry and exit
-                
-                trades.append({
-                    'entry_date': data.index[entry_idx],
-                    'exit_date': data.index[exit_idx],
-                    'entry_price': entry_price,
-                    'exit_price': exit_price,
-                    'return': trade_return,
-                    'profit_loss': trade_return * self.initial_capital,
-                    'duration': exit_idx - entry_idx,
-                    'type': 'LONG'
-                })
-                
-                in_position = False
+        for entry_idx, exit_idx in zip(entries.tolist(), exits.tolist()):
+            entry_price = close[entry_idx]
+            exit_price = close[exit_idx]
+            
+            # Calculate trade return
+            trade_return = (exit_price - entry_price) / entry_price
+            
+            # Apply costs
+            trade_return -= (self.commission_rate + self.slippage_rate) * 2  # Entry and exit
+            
+            trades.append({
+                'entry_date': data.index[entry_idx],
+                'exit_date': data.index[exit_idx],
+                'entry_price': entry_price,
+                'exit_price': exit_price,
+                'return': trade_return,
+                'profit_loss': trade_return * self.initial_capital,
+                'duration': exit_idx - entry_idx,
+                'type': 'LONG'
+            })
         
         return trades
     
     def run_backtest(
         self,
         strategy_config: Dict,
-        calculate_indicators: bool = True
+        calculate_indicators: bool = True,
+        min_partial_sharpe: Optional[float] = None
     ) -> Dict:
         """
         Run backtest for a strategy configuration
@@ -235,12 +306,15 @@ class VectorizedBacktester:
                 - entry_rules: Dict with entry condition
                 - exit_rules: Dict with exit condition
             calculate_indicators: Whether to calculate indicators (default: True)
+            min_partial_sharpe: Abandon the backtest if the Sharpe ratio over
+                the first half of the data falls below this (default: None)
             
         Returns:
             Dictionary with backtest results and metrics
             
         Raises:
             BacktestError: If backtest fails
+            BacktestPruned: If the partial Sharpe ratio is below ``min_partial_sharpe``
         """
         try:
             logger.info("Starting backtest execution")
@@ -268,6 +342,20 @@ class VectorizedBacktester:
             # Calculate returns
             df = self._calculate_returns(df)
             
+            # Bail out before trade extraction and metrics when the first
+            # half already rules the strategy out
+            metrics_calculator = PerformanceMetrics(
+                risk_free_rate=settings.RISK_FREE_RATE,
+                periods_per_year=252
+            )
+            if min_partial_sharpe is not None:
+                partial_returns = df['Net_Returns'].iloc[:len(df) // 2].dropna()
+                partial_sharpe = metrics_calculator.sharpe_ratio(partial_returns)
+                if partial_sharpe < min_partial_sharpe:
+                    raise BacktestPruned(
+                        f"Partial Sharpe {partial_sharpe:.4f} below {min_partial_sharpe:.4f}"
+                    )
+            
             # Extract trades
             self.trades = self._extract_trades(df)
             # Compute turnover and avg trade duration
@@ -292,12 +380,6 @@ class VectorizedBacktester:
             except Exception:
                 pass
             
-            # Calculate metrics
-            metrics_calculator = PerformanceMetrics(
-                risk_free_rate=settings.RISK_FREE_RATE,
-                periods_per_year=252
-            )
-            
             # Get returns series (drop NaN values)
             returns = df['Net_Returns'].dropna()
             
@@ -340,6 +422,8 @@ class VectorizedBacktester:
             
             return result
             
+        except BacktestPruned:
+            raise
         except (InvalidStrategyError, InsufficientDataError) as e:
             raise BacktestError(str(e))
         except Exception as e:
@@ -1,22 +1,39 @@
 from __future__ import annotations
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 from datetime import datetime
+import heapq
+import time
 
 from app.core.config import get_settings
 
 
 _costs: Dict[str, Dict[str, Any]] = {}
+# Min-heap of (updated_at_ts, trace_id); superseded entries are skipped lazily
+_costs_index: List[Tuple[float, str]] = []
+
+
+def _touch(trace_id: str, b: Dict[str, Any]) -> None:
+    # Epoch seconds for comparisons, ISO string of the same instant for display
+    ts = time.time()
+    b["updated_at_ts"] = ts
+    b["updated_at"] = datetime.utcfromtimestamp(ts).isoformat()
+    heapq.heappush(_costs_index, (ts, trace_id))
+    if len(_costs_index) > 4 * len(_costs) + 64:
+        _costs_index[:] = [(e["updated_at_ts"], tid) for tid, e in _costs.items()]
+        heapq.heapify(_costs_index)
 
 
 def _bucket(trace_id: str) -> Dict[str, Any]:
-    b = _costs.setdefault(trace_id, {
-        "bytes_written": 0,
-        "bytes_read": 0,
-        "objects_written": 0,
-        "objects_read": 0,
-        "compute_ms": 0,
-        "updated_at": datetime.utcnow().isoformat(),
-    })
+    b = _costs.get(trace_id)
+    if b is None:
+        b = _costs[trace_id] = {
+            "bytes_written": 0,
+            "bytes_read": 0,
+            "objects_written": 0,
+            "objects_read": 0,
+            "compute_ms": 0,
+        }
+        _touch(trace_id, b)
     return b
 
 
@@ -26,13 +43,13 @@ def add_io(trace_id: str, *, bytes_written: int = 0, bytes_read: int = 0, object
     b["bytes_read"] += int(bytes_read)
     b["objects_written"] += int(objects_written)
     b["objects_read"] += int(objects_read)
-    b["updated_at"] = datetime.utcnow().isoformat()
+    _touch(trace_id, b)
 
 
 def add_compute(trace_id: str, ms: int) -> None:
     b = _bucket(trace_id)
     b["compute_ms"] += int(ms)
-    b["updated_at"] = datetime.utcnow().isoformat()
+    _touch(trace_id, b)
 
 
 def get_costs(trace_id: str) -> Dict[str, Any]:
@@ -48,3 +65,18 @@ def get_costs(trace_id: str) -> Dict[str, Any]:
 def clear(trace_id: str) -> None:
     _costs.pop(trace_id, None)
 
+
+def pop_stale(cutoff_ts: float) -> List[str]:
+    """Remove from the index and return trace ids last updated before ``cutoff_ts``"""
+    stale: List[str] = []
+    # Touches within one clock tick leave several entries with the current
+    # timestamp, so each trace is yielded once
+    seen = set()
+    while _costs_index and _costs_index[0][0] < cutoff_ts:
+        ts, trace_id = heapq.heappop(_costs_index)
+        entry = _costs.get(trace_id)
+        if entry is not None and entry["updated_at_ts"] == ts and trace_id not in seen:
+            seen.add(trace_id)
+            stale.append(trace_id)
+    return stale
+
@@ -3,21 +3,49 @@
 Market Data Fetcher with Caching
 Uses yfinance for data retrieval with intelligent caching mechanism
 """
-import yfinance as yf
 import pandas as pd
 import pickle
 import hashlib
+import os
+from functools import lru_cache
 from pathlib import Path
-from datetime import datetime, timedelta
+import time
 from typing import Optional
 import logging
 from app.core.config import get_settings
 from app.utils.exceptions import DataFetchError, InsufficientDataError
-from app.utils.validators import validate_date_range
+from app.utils.validators import OHLCV_COLUMNS, validate_dataframe, validate_date_range
+
+try:
+    import lz4.frame as lz4_frame  # type: ignore
+except Exception:  # pragma: no cover - lz4 is optional
+    lz4_frame = None
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# Magic number at the start of every LZ4 frame; lets legacy plain-pickle
+# cache files keep loading after compression is enabled
+_LZ4_FRAME_MAGIC = b"\x04\x22\x4d\x18"
+_CACHE_READ_BUFFER = 1 << 20
+_SECONDS_PER_DAY = 86400.0
+
+
+@lru_cache(maxsize=4096)
+def _cache_key(symbol: str, start_date: str, end_date: str, interval: str, name_max: int) -> str:
+    """Build the sanitized cache key; memoized since sweeps revisit the same keys"""
+    key_string = f"{symbol}__{start_date}__{end_date}__{interval}"
+    key_string = key_string.replace("/", "_").replace("\\", "_")
+    if len(key_string) + len(".pkl") > name_max:
+        return hashlib.md5(key_string.encode()).hexdigest()
+    return key_string
+
+
+@lru_cache(maxsize=4096)
+def _cache_path(cache_dir: Path, cache_key: str) -> Path:
+    """Build the cache file path; Path objects are immutable so sharing is safe"""
+    return cache_dir / f"{cache_key}.pkl"
+
 
 class MarketDataFetcher:
     """
@@ -41,7 +69,12 @@ class MarketDataFetcher:
         self.cache_dir = Path(cache_dir or settings.CACHE_DIR)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.cache_expiry_days = cache_expiry_days
-        logger.info(f"Initialized MarketDataFetcher with cache dir: {self.cache_dir}")
+        try:
+            self._name_max = os.pathconf(self.cache_dir, "PC_NAME_MAX")
+        except (AttributeError, ValueError, OSError):
+            # os.pathconf is unavailable on Windows; 255 is the common limit
+            self._name_max = 255
+        logger.info("Initialized MarketDataFetcher with cache dir: %s", self.cache_dir)
     
     def _generate_cache_key(
         self,
@@ -53,6 +86,10 @@ class MarketDataFetcher:
         """
         Generate unique cache key for data request
         
+        The key is the request parameters themselves, sanitized for use as a
+        filename, so cache entries stay readable on disk. Only keys too long
+        for the filesystem fall back to an MD5 digest.
+        
         Args:
             symbol: Ticker symbol
             start_date: Start date
@@ -62,12 +99,11 @@ class MarketDataFetcher:
         Returns:
             Cache key string
         """
-        key_string = f"{symbol}_{start_date}_{end_date}_{interval}"
-        return hashlib.md5(key_string.encode()).hexdigest()
+        return _cache_key(symbol, start_date, end_date, interval, self._name_max)
     
     def _get_cache_path(self, cache_key: str) -> Path:
         """Get full path for cache file"""
-        return self.cache_dir / f"{cache_key}.pkl"
+        return _cache_path(self.cache_dir, cache_key)
     
     def _is_cache_valid(self, cache_path: Path) -> bool:
         """
@@ -79,13 +115,14 @@ class MarketDataFetcher:
         Returns:
             True if cache is valid, False otherwise
         """
-        if not cache_path.exists():
+        try:
+            mtime = cache_path.stat().st_mtime
+        except FileNotFoundError:
             return False
         
         # Check cache age
-        cache_age = datetime.now() - datetime.fromtimestamp(cache_path.stat().st_mtime)
-        if cache_age > timedelta(days=self.cache_expiry_days):
-            logger.debug(f"Cache expired: {cache_path.name}")
+        if time.time() - mtime > self.cache_expiry_days * _SECONDS_PER_DAY:
+            logger.debug("Cache expired: %s", cache_path.name)
             return False
         
         return True
@@ -94,6 +131,10 @@ class MarketDataFetcher:
         """
         Load data from cache file
         
+        Handles both LZ4-compressed entries and legacy plain pickles. A
+        compressed entry that cannot be decoded here (lz4 not installed) is a
+        cache miss, so the data is refetched and the entry rewritten.
+        
         Args:
             cache_path: Path to cache file
             
@@ -101,28 +142,39 @@ class MarketDataFetcher:
             DataFrame if successful, None otherwise
         """
         try:
-            with open(cache_path, 'rb') as f:
-                data = pickle.load(f)
-            logger.info(f"Loaded data from cache: {cache_path.name}")
+            with open(cache_path, 'rb', buffering=_CACHE_READ_BUFFER) as f:
+                payload = f.read()
+            if payload[:4] == _LZ4_FRAME_MAGIC:
+                if lz4_frame is None:
+                    logger.info("Cache %s is LZ4-compressed but lz4 is not installed; refetching", cache_path.name)
+                    return None
+                payload = lz4_frame.decompress(payload)
+            data = pickle.loads(payload)
+            logger.info("Loaded data from cache: %s", cache_path.name)
             return data
         except Exception as e:
-            logger.warning(f"Error loading cache {cache_path.name}: {str(e)}")
+            logger.warning("Error loading cache %s: %s", cache_path.name, e)
             return None
     
     def _save_to_cache(self, data: pd.DataFrame, cache_path: Path) -> None:
         """
         Save data to cache file
         
+        Entries are LZ4-compressed when lz4 is installed, plain pickles otherwise.
+        
         Args:
             data: DataFrame to cache
             cache_path: Path to cache file
         """
         try:
+            payload = pickle.dumps(data, protocol=5)
+            if lz4_frame is not None:
+                payload = lz4_frame.compress(payload, content_checksum=False)
             with open(cache_path, 'wb') as f:
-                pickle.dump(data, f)
-            logger.info(f"Saved data to cache: {cache_path.name}")
+                f.write(payload)
+            logger.info("Saved data to cache: %s", cache_path.name)
         except Exception as e:
-            logger.warning(f"Error saving cache {cache_path.name}: {str(e)}")
+            logger.warning("Error saving cache %s: %s", cache_path.name, e)
     
     def _validate_and_clean_data(self, data: pd.DataFrame) -> pd.DataFrame:
         """
@@ -148,14 +200,10 @@ class MarketDataFetcher:
             raise InsufficientDataError("All data rows contain NaN values")
         
         if len(data) < initial_len:
-            logger.warning(f"Removed {initial_len - len(data)} rows with NaN values")
+            logger.warning("Removed %d rows with NaN values", initial_len - len(data))
         
         # Ensure required columns exist
-        required_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
-        missing_columns = set(required_columns) - set(data.columns)
-        
-        if missing_columns:
-            raise InsufficientDataError(f"Missing required columns: {missing_columns}")
+        validate_dataframe(data, OHLCV_COLUMNS)
         
         # Ensure index is datetime
         if not isinstance(data.index, pd.DatetimeIndex):
@@ -167,7 +215,7 @@ class MarketDataFetcher:
         # Sort by date
         data = data.sort_index()
         
-        logger.info(f"Validated and cleaned data: {len(data)} rows")
+        logger.info("Validated and cleaned data: %d rows", len(data))
         return data
     
     def fetch_data(
@@ -200,20 +248,24 @@ class MarketDataFetcher:
             start_dt, end_dt = validate_date_range(start_date, end_date)
             end_date_str = end_dt.strftime("%Y-%m-%d")
             
-            logger.info(f"Fetching data for {symbol} from {start_date} to {end_date_str}, interval: {interval}")
+            logger.info(
+                "Fetching data for %s from %s to %s, interval: %s",
+                symbol, start_date, end_date_str, interval
+            )
+            
+            cache_key = self._generate_cache_key(symbol, start_date, end_date_str, interval)
+            cache_path = self._get_cache_path(cache_key)
             
             # Check cache if not forcing refresh
             if not force_refresh:
-                cache_key = self._generate_cache_key(symbol, start_date, end_date_str, interval)
-                cache_path = self._get_cache_path(cache_key)
-                
                 if self._is_cache_valid(cache_path):
                     cached_data = self._load_from_cache(cache_path)
                     if cached_data is not None:
                         return cached_data
             
             # Fetch from yfinance
-            logger.info(f"Fetching fresh data from yfinance for {symbol}")
+            logger.info("Fetching fresh data from yfinance for %s", symbol)
+            import yfinance as yf  # deferred: keeps ~0.1s of imports off app start-up
             ticker = yf.Ticker(symbol)
             
             try:
@@ -231,15 +283,13 @@ class MarketDataFetcher:
             
             # Check minimum data points
             if len(data) < 50:
-                logger.warning(f"Limited data available for {symbol}: {len(data)} rows")
+                logger.warning("Limited data available for %s: %d rows", symbol, len(data))
             
             # Save to cache
             if not force_refresh:
-                cache_key = self._generate_cache_key(symbol, start_date, end_date_str, interval)
-                cache_path = self._get_cache_path(cache_key)
                 self._save_to_cache(data, cache_path)
             
-            logger.info(f"Successfully fetched {len(data)} rows for {symbol}")
+            logger.info("Successfully fetched %d rows for %s", len(data), symbol)
             return data
             
         except (DataFetchError, InsufficientDataError):
@@ -273,7 +323,7 @@ class MarketDataFetcher:
                 data = self.fetch_data(symbol, start_date, end_date, interval)
                 results[symbol] = data
             except Exception as e:
-                logger.error(f"Error fetching data for {symbol}: {str(e)}")
+                logger.error("Error fetching data for %s: %s", symbol, e)
                 results[symbol] = None
         
         return results
@@ -289,21 +339,23 @@ class MarketDataFetcher:
             Number of files deleted
         """
         deleted_count = 0
+        now = time.time()
+        max_age = older_than_days * _SECONDS_PER_DAY if older_than_days is not None else None
         
-        for cache_file in self.cache_dir.glob("*.pkl"):
-            try:
-                if older_than_days is None:
-                    cache_file.unlink()
-                    deleted_count += 1
-                else:
-                    cache_age = datetime.now() - datetime.fromtimestamp(cache_file.stat().st_mtime)
-                    if cache_age > timedelta(days=older_than_days):
-                        cache_file.unlink()
+        # DirEntry.stat() is cached from the directory scan, so each file is
+        # stat'ed at most once
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".pkl") or not entry.is_file():
+                    continue
+                try:
+                    if max_age is None or now - entry.stat().st_mtime > max_age:
+                        os.unlink(entry.path)
                         deleted_count += 1
-            except Exception as e:
-                logger.warning(f"Error deleting cache file {cache_file.name}: {str(e)}")
+                except Exception as e:
+                    logger.warning("Error deleting cache file %s: %s", entry.name, e)
         
-        logger.info(f"Cleared {deleted_count} cache files")
+        logger.info("Cleared %d cache files", deleted_count)
         return deleted_count
     
     def get_ticker_info(self, symbol: str) -> dict:
@@ -317,6 +369,7 @@ class MarketDataFetcher:
             Dictionary with ticker information
         """
         try:
+            import yfinance as yf  # deferred, see fetch_data
             ticker = yf.Ticker(symbol)
             info = ticker.info
             return {
@@ -328,5 +381,5 @@ class MarketDataFetcher:
                 'currency': info.get('currency', 'USD')
             }
         except Exception as e:
-            logger.error(f"Error fetching ticker info for {symbol}: {str(e)}")
+            logger.error("Error fetching ticker info for %s: %s", symbol, e)
             return {'symbol': symbol, 'error': str(e)}
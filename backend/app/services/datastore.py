@@ -1,48 +1,84 @@
 from __future__ import annotations
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
 
 from app.core.config import get_settings
-from app.services.storage.memory import MemoryBackend
-from app.services.storage.local_parquet import LocalParquetBackend
 
-def _maybe_add_s3(backends: Dict[str, Any]) -> None:
-    try:
-        from app.services.storage.s3 import S3Backend
-        backends["s3"] = S3Backend()
-    except Exception:
-        # Not enabled or boto3 missing; ignore
-        pass
 
+def _make_memory() -> Any:
+    from app.services.storage.memory import MemoryBackend
+    return MemoryBackend()
 
-def _maybe_add_gcs(backends: Dict[str, Any]) -> None:
-    try:
-        from app.services.storage.gcs import GCSBackend
-        backends["gcs"] = GCSBackend()
-    except Exception:
-        pass
 
+def _make_local() -> Any:
+    from app.services.storage.local_parquet import LocalParquetBackend
+    return LocalParquetBackend()
 
-def _maybe_add_azure(backends: Dict[str, Any]) -> None:
-    try:
-        from app.services.storage.azure_blob import AzureBlobBackend
-        backends["azure"] = AzureBlobBackend()
-    except Exception:
-        pass
 
+def _make_s3() -> Any:
+    from app.services.storage.s3 import S3Backend
+    return S3Backend()
 
-_backends: Dict[str, Any] = {
-    "memory": MemoryBackend(),
-    "local": LocalParquetBackend(),
+
+def _make_gcs() -> Any:
+    from app.services.storage.gcs import GCSBackend
+    return GCSBackend()
+
+
+def _make_azure() -> Any:
+    from app.services.storage.azure_blob import AzureBlobBackend
+    return AzureBlobBackend()
+
+
+_factories: Dict[str, Callable[[], Any]] = {
+    "memory": _make_memory,
+    "local": _make_local,
+    "s3": _make_s3,
+    "gcs": _make_gcs,
+    "azure": _make_azure,
 }
-_maybe_add_s3(_backends)
-_maybe_add_gcs(_backends)
-_maybe_add_azure(_backends)
+
+# Backends instantiated so far in this process, in creation order
+_active: Dict[str, Any] = {}
+
+
+@lru_cache(maxsize=None)
+def _backend(name: str) -> Any:
+    # Cloud backends raise if disabled or their SDK is missing; lru_cache does
+    # not cache exceptions, so a later call can retry once configured
+    b = _factories[name]()
+    _active[name] = b
+    return b
+
+
+# Backends that persist across processes, with the setting that enables them
+_PERSISTENT = (
+    ("local", None),
+    ("s3", "S3_ENABLED"),
+    ("gcs", "GCS_ENABLED"),
+    ("azure", "AZURE_ENABLED"),
+)
+
+
+def _known_backends() -> Dict[str, Any]:
+    # Persistent backends may hold a trace's artifacts from another process
+    # (or before a restart), so include every enabled one even if nothing has
+    # touched it yet in this one
+    settings = get_settings()
+    for name, flag in _PERSISTENT:
+        if flag is None or getattr(settings, flag, False):
+            try:
+                _backend(name)
+            except Exception:
+                # SDK missing or misconfigured; retried on the next call
+                pass
+    return dict(_active)
 
 
 def _choose_backend(preferred: Optional[str] = None) -> Any:
     settings = get_settings()
     backend_name = preferred or getattr(settings, "DEFAULT_STORAGE_BACKEND", "local")
-    return _backends[backend_name]
+    return _backend(backend_name)
 
 
 def ds_put(trace_id: str, key: str, value: Any, *, backend: Optional[str] = None, meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -50,15 +86,17 @@ def ds_put(trace_id: str, key: str, value: Any, *, backend: Optional[str] = None
     return b.put(trace_id, key, value, meta)
 
 
-def ds_get(trace_id: str, key: str, *, backend: Optional[str] = None, default: Any = None) -> Any:
+def ds_get(trace_id: str, key: str, *, backend: Optional[str] = None, default: Any = None, columns: Optional[List[str]] = None, ext: Optional[str] = None) -> Any:
+    # Pass the "ext" that ds_put returned to read that one object directly
+    # instead of probing each format in turn
     b = _choose_backend(backend)
-    res = b.get(trace_id, key)
+    res = b.get(trace_id, key, columns=columns, ext=ext)
     return default if res is None else res
 
 
 def ds_list(trace_id: str) -> Dict[str, Any]:
     items: Dict[str, Any] = {}
-    for name, b in _backends.items():
+    for name, b in _known_backends().items():
         try:
             if hasattr(b, "list"):
                 items[name] = b.list(trace_id, limit=100)
@@ -77,7 +115,7 @@ def ds_delete(trace_id: str, key: str, *, backend: Optional[str] = None) -> None
 def ds_clear(trace_id: str, *, backend: Optional[str] = None) -> None:
     # Clear across all backends if none specified
     if backend is None:
-        for b in _backends.values():
+        for b in _known_backends().values():
             try:
                 b.clear(trace_id)
             except Exception:
@@ -5,13 +5,360 @@ Implements SMA, EMA, RSI, MACD, and Bollinger Bands
 """
 import pandas as pd
 import numpy as np
-from typing import Tuple, Optional
+from collections import OrderedDict
+from typing import Dict, Tuple, Optional
+import hashlib
 import logging
+import threading
+from numpy.lib.stride_tricks import sliding_window_view
+from app.services._njit import NUMBA_AVAILABLE, njit, prange
 from app.utils.exceptions import IndicatorCalculationError, InsufficientDataError
 
 logger = logging.getLogger(__name__)
 
 
+@njit(cache=True, nogil=True)
+def _rsi_wilder(x: np.ndarray, period: int) -> np.ndarray:
+    """
+    Fused Wilder RSI over a NaN-free float64 array
+
+    Mirrors the pandas path (ewm(alpha=1/period, adjust=False) on gains and
+    losses, warm-up and zero-loss rows filled with 100) in a single pass.
+    """
+    n = x.shape[0]
+    out = np.empty(n)
+    alpha = 1.0 / period
+    avg_gain = 0.0
+    avg_loss = 0.0
+    out[0] = 100.0
+    for i in range(1, n):
+        delta = x[i] - x[i - 1]
+        gain = max(delta, 0.0)
+        loss = max(-delta, 0.0)
+        avg_gain = (1.0 - alpha) * avg_gain + alpha * gain
+        avg_loss = (1.0 - alpha) * avg_loss + alpha * loss
+        if i < period - 1 or avg_loss == 0.0:
+            out[i] = 100.0
+        else:
+            out[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _macd_fused(
+    x: np.ndarray, fast_period: int, slow_period: int, signal_period: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Fast/slow EMA, MACD line, signal line and histogram in a single pass
+
+    Matches chained ewm(span=..., adjust=False, min_periods=span) calls: the
+    EMAs are seeded with the first price and the signal EMA with the first
+    defined MACD value, with NaN for the warm-up rows.
+    """
+    n = x.shape[0]
+    macd_line = np.full(n, np.nan)
+    signal_line = np.full(n, np.nan)
+    histogram = np.full(n, np.nan)
+    alpha_fast = 2.0 / (fast_period + 1)
+    alpha_slow = 2.0 / (slow_period + 1)
+    alpha_signal = 2.0 / (signal_period + 1)
+    macd_start = max(fast_period, slow_period) - 1
+    signal_start = macd_start + signal_period - 1
+    ema_fast = x[0]
+    ema_slow = x[0]
+    signal = 0.0
+    for i in range(n):
+        if i > 0:
+            ema_fast = (1.0 - alpha_fast) * ema_fast + alpha_fast * x[i]
+            ema_slow = (1.0 - alpha_slow) * ema_slow + alpha_slow * x[i]
+        if i < macd_start:
+            continue
+        m = ema_fast - ema_slow
+        macd_line[i] = m
+        if i == macd_start:
+            signal = m
+        else:
+            signal = (1.0 - alpha_signal) * signal + alpha_signal * m
+        if i >= signal_start:
+            signal_line[i] = signal
+            histogram[i] = m - signal
+    return macd_line, signal_line, histogram
+
+
+# Above this length cumulative sums lose too much precision to cancellation;
+# pandas' rolling aggregations are used instead
+_CUMSUM_MAX_LEN = 1_000_000
+
+# Windows between exact recomputations in _rolling_mean_std
+_WELFORD_RESYNC = 1024
+
+
+@njit(cache=True, nogil=True)
+def _rolling_mean_std(x: np.ndarray, period: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rolling mean and sample standard deviation in O(n) via Welford updates
+
+    Each step swaps the oldest value out of the window and the newest in with
+    one add/remove update of the window mean and sum of squared deviations;
+    every ``_WELFORD_RESYNC`` windows the state is recomputed from the window
+    itself, so precision does not degrade with the series' length or trend
+    the way differences of running sums do. Returns float64 arrays aligned with ``x``
+    with NaN for the warm-up rows.
+    """
+    n = x.shape[0]
+    mean = np.full(n, np.nan)
+    std = np.full(n, np.nan)
+    if n < period:
+        return mean, std
+    m = 0.0
+    m2 = 0.0
+    for i in range(period - 1, n):
+        if (i - period + 1) % _WELFORD_RESYNC == 0:
+            # Rebuild the window's state from scratch so rounding from the
+            # incremental updates cannot accumulate along the series
+            m = 0.0
+            m2 = 0.0
+            for j in range(period):
+                v = x[i - period + 1 + j]
+                delta = v - m
+                m += delta / (j + 1)
+                m2 += delta * (v - m)
+        else:
+            new = x[i]
+            old = x[i - period]
+            prev = m
+            delta = new - old
+            m += delta / period
+            m2 += delta * (new - m + old - prev)
+        mean[i] = m
+        std[i] = np.sqrt(max(m2, 0.0) / (period - 1))
+    return mean, std
+
+
+@njit(cache=True, nogil=True)
+def _ema_into(x: np.ndarray, period: int, out: np.ndarray) -> None:
+    """Write ewm(span=period, adjust=False, min_periods=period) of ``x`` into ``out``"""
+    alpha = 2.0 / (period + 1)
+    ema = x[0]
+    for i in range(x.shape[0]):
+        if i > 0:
+            ema = (1.0 - alpha) * ema + alpha * x[i]
+        if i >= period - 1:
+            out[i] = ema
+
+
+@njit(cache=True, nogil=True)
+def _ema_continue(state: float, x: np.ndarray, period: int) -> np.ndarray:
+    """Advance an adjust=False EMA from ``state`` over the new bars ``x``"""
+    alpha = 2.0 / (period + 1)
+    out = np.empty(x.shape[0])
+    ema = state
+    for i in range(x.shape[0]):
+        ema = (1.0 - alpha) * ema + alpha * x[i]
+        out[i] = ema
+    return out
+
+
+# Byte budget for memoized indicator outputs, evicted least recently used first
+_RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+_result_cache: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+_result_cache_bytes = 0
+_result_cache_lock = threading.Lock()
+
+# Most recent EMA input per period as (length, digest), for append-only reuse
+_ema_last: Dict[int, Tuple[int, bytes]] = {}
+
+
+def _digest(x: np.ndarray) -> bytes:
+    """Content fingerprint of a price array"""
+    return hashlib.blake2b(np.ascontiguousarray(x).data, digest_size=16).digest()
+
+
+def _cache_get(key: tuple) -> Optional[np.ndarray]:
+    """Cached result for ``key``; callers must not modify it"""
+    with _result_cache_lock:
+        arr = _result_cache.get(key)
+        if arr is not None:
+            _result_cache.move_to_end(key)
+        return arr
+
+
+def _cache_put(key: tuple, arr: np.ndarray) -> None:
+    """Store a private read-only copy of ``arr`` under ``key``"""
+    global _result_cache_bytes
+    if arr.nbytes > _RESULT_CACHE_MAX_BYTES:
+        return
+    arr = arr.copy(order='K')
+    arr.setflags(write=False)
+    with _result_cache_lock:
+        old = _result_cache.pop(key, None)
+        if old is not None:
+            _result_cache_bytes -= old.nbytes
+        _result_cache[key] = arr
+        _result_cache_bytes += arr.nbytes
+        while _result_cache_bytes > _RESULT_CACHE_MAX_BYTES:
+            _, evicted = _result_cache.popitem(last=False)
+            _result_cache_bytes -= evicted.nbytes
+
+
+def clear_indicator_cache() -> None:
+    """Drop all memoized indicator results"""
+    global _result_cache_bytes
+    with _result_cache_lock:
+        _result_cache.clear()
+        _result_cache_bytes = 0
+        _ema_last.clear()
+
+
+# Above this length the O(n^2) weight matrix costs more than the recurrence
+_EMA_DOT_MAX_LEN = 64
+
+
+def _ema_dot(x: np.ndarray, period: int) -> np.ndarray:
+    """
+    ewm(span=period, adjust=False, min_periods=period) as one matrix product
+
+    Row i of the lower-triangular Toeplitz weight matrix holds the geometric
+    weights alpha * (1 - alpha)^(i - j); the seed price carries (1 - alpha)^i.
+    """
+    n = x.shape[0]
+    alpha = 2.0 / (period + 1)
+    decay = (1.0 - alpha) ** np.arange(n)
+    lags = np.concatenate((alpha * decay[::-1], np.zeros(n - 1)))
+    weights = sliding_window_view(lags, n)[::-1]
+    out = weights @ x + (1.0 - alpha) * decay * x[0]
+    out[:period - 1] = np.nan
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _rolling_mean(x: np.ndarray, period: int) -> np.ndarray:
+    """Rolling mean via running sums, NaN for the warm-up rows"""
+    shift = x.mean()
+    csum = np.concatenate((np.zeros(1), np.cumsum(x - shift)))
+    mean = np.full(x.shape[0], np.nan)
+    mean[period - 1:] = (csum[period:] - csum[:-period]) / period + shift
+    return mean
+
+
+# Column order of the buffer filled by _all_indicators_kernel
+_ALL_INDICATOR_COLUMNS = [
+    'SMA_20', 'SMA_50', 'SMA_200',
+    'EMA_12', 'EMA_26', 'EMA_50',
+    'RSI_14',
+    'MACD_Line', 'MACD_Signal', 'MACD_Histogram',
+    'BB_Upper', 'BB_Middle', 'BB_Lower',
+]
+_ALL_INDICATORS_MIN_POINTS = 200
+
+
+@njit(parallel=True, cache=True, nogil=True)
+def _all_indicators_rows(x: np.ndarray) -> np.ndarray:
+    """
+    Every default indicator as one row of a (13, n) buffer
+
+    The indicators are independent given ``x``, so each prange task fills
+    its own contiguous rows (SMA_20 and the Bollinger bands share a task
+    because they share the rolling mean).
+    """
+    out = np.full((13, x.shape[0]), np.nan, dtype=x.dtype)
+    for task in prange(8):
+        if task == 0:
+            bb_mean, bb_std = _rolling_mean_std(x, 20)
+            out[0] = bb_mean
+            out[10] = bb_mean + bb_std * 2.0
+            out[11] = bb_mean
+            out[12] = bb_mean - bb_std * 2.0
+        elif task == 1:
+            out[1] = _rolling_mean(x, 50)
+        elif task == 2:
+            out[2] = _rolling_mean(x, 200)
+        elif task == 3:
+            _ema_into(x, 12, out[3])
+        elif task == 4:
+            _ema_into(x, 26, out[4])
+        elif task == 5:
+            _ema_into(x, 50, out[5])
+        elif task == 6:
+            out[6] = _rsi_wilder(x, 14)
+        else:
+            macd_line, signal_line, histogram = _macd_fused(x, 12, 26, 9)
+            out[7] = macd_line
+            out[8] = signal_line
+            out[9] = histogram
+    return out
+
+
+def _all_indicators_kernel(x: np.ndarray) -> np.ndarray:
+    """
+    Fill one (n, 13) buffer of ``x``'s dtype with every default indicator
+
+    Expects a NaN-free array of at least ``_ALL_INDICATORS_MIN_POINTS`` values;
+    columns follow ``_ALL_INDICATOR_COLUMNS``. The buffer is column-major, which
+    is the block layout pandas uses, so wrapping it in a DataFrame copies nothing.
+    """
+    return _all_indicators_rows(x).T
+
+
+def _check_points(n: int, period: int, name: str) -> None:
+    if n < period:
+        raise InsufficientDataError(
+            f"Insufficient data for {name} calculation. Need at least {period} points, got {n}"
+        )
+
+
+def _sma_np(x: np.ndarray, period: int, digest: bytes) -> np.ndarray:
+    """Rolling mean of a float64 array whose content digest is ``digest``"""
+    key = ('sma', period, digest)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached.copy()
+    out = pd.Series(x, copy=False).rolling(window=period, min_periods=period).mean().to_numpy()
+    _cache_put(key, out)
+    return out
+
+
+def _ema_np(x: np.ndarray, period: int, digest: bytes) -> np.ndarray:
+    """Adjust=False EMA of a float64 array whose content digest is ``digest``"""
+    n = x.shape[0]
+    has_nan = np.isnan(x).any()
+    key = ('ema', period, digest)
+    cached = _cache_get(key)
+    out = None
+    
+    if cached is not None:
+        out = cached.copy()
+    elif not has_nan:
+        # Append-only reuse: if the previous input for this period is
+        # a prefix of this one, advance its EMA over the new bars only
+        prev = _ema_last.get(period)
+        if prev is not None and period <= prev[0] < n:
+            head = _cache_get(('ema', period, prev[1]))
+            if head is not None and _digest(x[:prev[0]]) == prev[1]:
+                tail = x[prev[0]:]
+                if NUMBA_AVAILABLE:
+                    tail_ema = _ema_continue(head[-1], tail, period)
+                else:
+                    seeded = pd.Series(np.concatenate(([head[-1]], tail)))
+                    tail_ema = seeded.ewm(span=period, adjust=False).mean().to_numpy()[1:]
+                out = np.concatenate((head, tail_ema))
+    
+    if out is None:
+        if n <= _EMA_DOT_MAX_LEN and n < 4 * period and not has_nan:
+            out = _ema_dot(x, period)
+        elif NUMBA_AVAILABLE and not has_nan:
+            out = np.full(n, np.nan)
+            _ema_into(x, period, out)
+        else:
+            out = pd.Series(x, copy=False).ewm(span=period, adjust=False, min_periods=period).mean().to_numpy()
+    
+    if cached is None:
+        _cache_put(key, out)
+    if not has_nan:
+        _ema_last[period] = (n, digest)
+    return out
+
+
 class TechnicalIndicators:
     """
     Technical indicators calculator for trading strategies
@@ -36,12 +383,10 @@ class TechnicalIndicators:
             InsufficientDataError: If insufficient data points
         """
         try:
-            if len(data) < period:
-                raise InsufficientDataError(
-                    f"Insufficient data for SMA calculation. Need at least {period} points, got {len(data)}"
-                )
+            _check_points(len(data), period, 'SMA')
             
-            sma_values = data.rolling(window=period, min_periods=period).mean()
+            values = data.to_numpy(dtype=np.float64)
+            sma_values = pd.Series(_sma_np(values, period, _digest(values)), index=data.index, copy=False)
             
             if column_name:
                 sma_values.name = column_name
@@ -75,12 +420,10 @@ class TechnicalIndicators:
             InsufficientDataError: If insufficient data points
         """
         try:
-            if len(data) < period:
-                raise InsufficientDataError(
-                    f"Insufficient data for EMA calculation. Need at least {period} points, got {len(data)}"
-                )
+            _check_points(len(data), period, 'EMA')
             
-            ema_values = data.ewm(span=period, adjust=False, min_periods=period).mean()
+            values = data.to_numpy(dtype=np.float64)
+            ema_values = pd.Series(_ema_np(values, period, _digest(values)), index=data.index, copy=False)
             
             if column_name:
                 ema_values.name = column_name
@@ -121,23 +464,29 @@ class TechnicalIndicators:
                     f"Insufficient data for RSI calculation. Need at least {period + 1} points, got {len(data)}"
                 )
             
-            # Calculate price changes
-            delta = data.diff()
-            
-            # Separate gains and losses
-            gains = delta.where(delta > 0, 0.0)
-            losses = -delta.where(delta < 0, 0.0)
+            values = data.to_numpy(dtype=np.float64)
             
-            # Calculate average gains and losses using EMA (Wilder's smoothing)
-            avg_gains = gains.ewm(alpha=1/period, min_periods=period, adjust=False).mean()
-            avg_losses = losses.ewm(alpha=1/period, min_periods=period, adjust=False).mean()
-            
-            # Calculate RS and RSI
-            rs = avg_gains / avg_losses
-            rsi_values = 100 - (100 / (1 + rs))
-            
-            # Handle division by zero (when avg_losses = 0)
-            rsi_values = rsi_values.fillna(100)
+            if NUMBA_AVAILABLE and not np.isnan(values).any():
+                # Single compiled pass instead of diff/where/ewm/divide pipelines
+                rsi_values = pd.Series(_rsi_wilder(values, period), index=data.index, copy=False)
+            else:
+                # Calculate price changes
+                delta = np.diff(values, prepend=np.nan)
+                
+                # Separate gains and losses; fmax maps the leading NaN to 0
+                gains = pd.Series(np.fmax(delta, 0.0), index=data.index, copy=False)
+                losses = pd.Series(np.fmax(-delta, 0.0), index=data.index, copy=False)
+                
+                # Calculate average gains and losses using EMA (Wilder's smoothing)
+                avg_gains = gains.ewm(alpha=1/period, min_periods=period, adjust=False).mean()
+                avg_losses = losses.ewm(alpha=1/period, min_periods=period, adjust=False).mean()
+                
+                # Calculate RS and RSI
+                rs = avg_gains / avg_losses
+                rsi_values = 100 - (100 / (1 + rs))
+                
+                # Handle division by zero (when avg_losses = 0)
+                rsi_values = rsi_values.fillna(100)
             
             if column_name:
                 rsi_values.name = column_name
@@ -189,18 +538,29 @@ class TechnicalIndicators:
                     f"Insufficient data for MACD calculation. Need at least {min_required} points, got {len(data)}"
                 )
             
-            # Calculate fast and slow EMAs
-            ema_fast = data.ewm(span=fast_period, adjust=False, min_periods=fast_period).mean()
-            ema_slow = data.ewm(span=slow_period, adjust=False, min_periods=slow_period).mean()
-            
-            # Calculate MACD line
-            macd_line = ema_fast - ema_slow
-            
-            # Calculate signal line
-            signal_line = macd_line.ewm(span=signal_period, adjust=False, min_periods=signal_period).mean()
+            values = data.to_numpy(dtype=np.float64)
             
-            # Calculate histogram
-            histogram = macd_line - signal_line
+            if NUMBA_AVAILABLE and not np.isnan(values).any():
+                # One compiled sweep for both EMAs, the signal EMA and the histogram
+                macd_arr, signal_arr, hist_arr = _macd_fused(
+                    values, fast_period, slow_period, signal_period
+                )
+                macd_line = pd.Series(macd_arr, index=data.index, copy=False)
+                signal_line = pd.Series(signal_arr, index=data.index, copy=False)
+                histogram = pd.Series(hist_arr, index=data.index, copy=False)
+            else:
+                # Calculate fast and slow EMAs
+                ema_fast = data.ewm(span=fast_period, adjust=False, min_periods=fast_period).mean()
+                ema_slow = data.ewm(span=slow_period, adjust=False, min_periods=slow_period).mean()
+                
+                # Calculate MACD line
+                macd_line = ema_fast - ema_slow
+                
+                # Calculate signal line
+                signal_line = macd_line.ewm(span=signal_period, adjust=False, min_periods=signal_period).mean()
+                
+                # Calculate histogram
+                histogram = macd_line - signal_line
             
             # Set names
             prefix = column_prefix if column_prefix else ""
@@ -251,11 +611,19 @@ class TechnicalIndicators:
                     f"Insufficient data for Bollinger Bands calculation. Need at least {period} points, got {len(data)}"
                 )
             
-            # Calculate middle band (SMA)
-            middle_band = data.rolling(window=period, min_periods=period).mean()
+            values = data.to_numpy(dtype=np.float64)
             
-            # Calculate standard deviation
-            std_dev = data.rolling(window=period, min_periods=period).std()
+            if period > 1 and len(values) <= _CUMSUM_MAX_LEN and not np.isnan(values).any():
+                # Middle band (SMA) and standard deviation from one set of running sums
+                mean, std = _rolling_mean_std(values, period)
+                middle_band = pd.Series(mean, index=data.index, copy=False)
+                std_dev = pd.Series(std, index=data.index, copy=False)
+            else:
+                # Calculate middle band (SMA)
+                middle_band = data.rolling(window=period, min_periods=period).mean()
+                
+                # Calculate standard deviation
+                std_dev = data.rolling(window=period, min_periods=period).std()
             
             # Calculate upper and lower bands
             upper_band = middle_band + (std_dev * num_std)
@@ -277,7 +645,8 @@ class TechnicalIndicators:
     def calculate_all_indicators(
         cls,
         data: pd.DataFrame,
-        price_column: str = 'Close'
+        price_column: str = 'Close',
+        dtype: np.dtype = np.float64
     ) -> pd.DataFrame:
         """
         Calculate all available indicators on a dataframe
@@ -285,35 +654,81 @@ class TechnicalIndicators:
         Args:
             data: DataFrame with OHLCV data
             price_column: Column to use for calculations (default: 'Close')
+            dtype: Float dtype of the indicator columns; np.float32 halves
+                the memory held by the result. Indicators are always computed
+                in float64 and only rounded to ``dtype`` on output, so float32
+                columns agree with float64 to float32 precision (~1e-7 relative)
             
         Returns:
-            DataFrame with all indicators added
+            New DataFrame with all indicators added; the input is left
+            unmodified, though the returned frame may share its column data
             
         Raises:
             IndicatorCalculationError: If calculation fails
         """
         try:
-            df = data.copy()
-            prices = df[price_column]
-            
-            # SMA indicators
-            df['SMA_20'] = cls.sma(prices, period=20)
-            df['SMA_50'] = cls.sma(prices, period=50)
-            df['SMA_200'] = cls.sma(prices, period=200)
-            
-            # EMA indicators
-            df['EMA_12'] = cls.ema(prices, period=12)
-            df['EMA_26'] = cls.ema(prices, period=26)
-            df['EMA_50'] = cls.ema(prices, period=50)
-            
-            # RSI
-            df['RSI_14'] = cls.rsi(prices, period=14)
-            
-            # MACD
-            df['MACD_Line'], df['MACD_Signal'], df['MACD_Histogram'] = cls.macd(prices)
-            
-            # Bollinger Bands
-            df['BB_Upper'], df['BB_Middle'], df['BB_Lower'] = cls.bollinger_bands(prices)
+            prices = data[price_column]
+            dtype = np.dtype(dtype)
+            # Accumulate in float64 whatever the output dtype
+            values = prices.to_numpy(dtype=np.float64)
+            
+            if (
+                NUMBA_AVAILABLE
+                and _ALL_INDICATORS_MIN_POINTS <= len(values) <= _CUMSUM_MAX_LEN
+                and not np.isnan(values).any()
+            ):
+                # One conversion and one output buffer for every indicator
+                key = ('all', dtype.str, _digest(values))
+                buffer = _cache_get(key)
+                if buffer is not None:
+                    buffer = buffer.copy(order='K')
+                else:
+                    buffer = _all_indicators_kernel(values)
+                    if dtype != np.float64:
+                        buffer = buffer.astype(dtype)
+                    _cache_put(key, buffer)
+                indicators = pd.DataFrame(
+                    buffer,
+                    index=data.index,
+                    columns=_ALL_INDICATOR_COLUMNS,
+                    copy=False,
+                )
+            else:
+                out = {}
+                
+                # Convert and fingerprint the prices once for all moving averages
+                x = values
+                digest = _digest(x)
+                
+                # SMA indicators
+                for period in (20, 50, 200):
+                    _check_points(len(x), period, 'SMA')
+                    out[f'SMA_{period}'] = pd.Series(_sma_np(x, period, digest), index=data.index, copy=False)
+                
+                # EMA indicators
+                for period in (12, 26, 50):
+                    out[f'EMA_{period}'] = pd.Series(_ema_np(x, period, digest), index=data.index, copy=False)
+                
+                # RSI
+                out['RSI_14'] = cls.rsi(prices, period=14)
+                
+                # MACD
+                out['MACD_Line'], out['MACD_Signal'], out['MACD_Histogram'] = cls.macd(prices)
+                
+                # Bollinger Bands
+                out['BB_Upper'], out['BB_Middle'], out['BB_Lower'] = cls.bollinger_bands(prices)
+                
+                # Keep each indicator's array as its own block rather than
+                # consolidating them into a fresh 2D copy
+                indicators = pd.concat(out, axis=1, copy=False)
+                if dtype != np.float64:
+                    indicators = indicators.astype(dtype)
+            
+            # Attach all indicator columns in one step instead of copying the
+            # input up front and inserting column by column
+            stale = data.columns.intersection(indicators.columns)
+            base = data.drop(columns=stale) if len(stale) else data
+            df = pd.concat([base, indicators], axis=1, copy=False)
             
             logger.info(f"Calculated all indicators for {len(df)} data points")
             return df
@@ -1,31 +1,102 @@
 from __future__ import annotations
 from typing import Optional, Dict, Any
 from pathlib import Path
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 
 from app.core.config import get_settings
+from app.services.data_sources.base import OHLCV_SCHEMA
+
+
+# Hive "date=YYYY-MM-DD" directories; kept as strings so ISO dates compare lexically
+_DATE_PARTITIONING = ds.partitioning(pa.schema([("date", pa.string())]), flavor="hive")
+_TIMESTAMP_TYPE = pa.timestamp("ns", tz="UTC")
+_MAX_ROW_GROUP = 100_000
+# Low-cardinality string columns worth dictionary-encoding on disk
+_DICTIONARY_COLUMNS = ("source",)
+
+
+def ohlcv_symbol_path(base: str, symbol: str) -> Path:
+    symbol_sanitized = symbol.replace("/", "-")
+    return Path(base) / "datasets" / "ohlcv" / symbol_sanitized
 
 
 def ohlcv_partition_path(base: str, symbol: str, ts: pd.Timestamp) -> Path:
     # Partition by symbol/date=YYYY-MM-DD
-    symbol_sanitized = symbol.replace("/", "-")
     date_part = ts.strftime("%Y-%m-%d")
-    return Path(base) / "datasets" / "ohlcv" / symbol_sanitized / f"date={date_part}"
+    return ohlcv_symbol_path(base, symbol) / f"date={date_part}"
+
+
+def _utc_timestamps(df: pd.DataFrame) -> pd.Series:
+    timestamps = df["timestamp"]
+    # Parse only when the column isn't already typed as tz-aware UTC
+    if not (isinstance(timestamps.dtype, pd.DatetimeTZDtype) and str(timestamps.dt.tz) == "UTC"):
+        timestamps = pd.to_datetime(timestamps, utc=True)
+    return timestamps
+
+
+def _to_table(frame: pd.DataFrame, schema: Optional[pa.Schema] = None) -> pa.Table:
+    # A given schema skips inferring one from the frame's dtypes
+    table = pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+    ts_idx = table.schema.get_field_index("timestamp")
+    return table.set_column(ts_idx, "timestamp", table.column(ts_idx).cast(_TIMESTAMP_TYPE))
+
 
+def _write_partition(table: pa.Table, base_path: str, symbol: str, date: Any) -> str:
+    p = ohlcv_partition_path(base_path, symbol, pd.Timestamp(date, tz="UTC"))
+    p.mkdir(parents=True, exist_ok=True)
+    file = p / "part.parquet"
+    pq.write_table(
+        table,
+        file,
+        compression="zstd",
+        compression_level=3,
+        row_group_size=min(table.num_rows, _MAX_ROW_GROUP),
+        use_dictionary=[c for c in _DICTIONARY_COLUMNS if c in table.column_names],
+    )
+    return str(file)
 
-def write_ohlcv_partition(df: pd.DataFrame, *, base: Optional[str] = None) -> Dict[str, Any]:
+
+def write_ohlcv_partition(df: pd.DataFrame, *, base: Optional[str] = None, schema: Optional[pa.Schema] = None) -> Dict[str, Any]:
     s = get_settings()
     base_path = base or s.LOCAL_STORAGE_BASE
     if df.empty:
         return {"written": 0, "partitions": []}
     partitions = []
-    for date, group in df.groupby(df["timestamp"].dt.date):
-        ts = pd.Timestamp(date, tz="UTC")
-        p = ohlcv_partition_path(base_path, df["symbol"].iloc[0], ts)
-        p.mkdir(parents=True, exist_ok=True)
-        file = p / "part.parquet"
-        group.to_parquet(file, index=False)
-        partitions.append(str(file))
+    symbol = df["symbol"].iloc[0]
+    timestamps = _utc_timestamps(df)
+    # symbol is encoded in the partition path, so it is not stored per row
+    frame = df.drop(columns=["symbol"]).assign(timestamp=timestamps)
+    for date, group in frame.groupby(timestamps.dt.date):
+        partitions.append(_write_partition(_to_table(group, schema), base_path, symbol, date))
+    return {"written": len(partitions), "partitions": partitions}
+
+
+def write_ohlcv_partitions(df: pd.DataFrame, *, base: Optional[str] = None, schema: Optional[pa.Schema] = None) -> Dict[str, Any]:
+    """Write a frame holding any number of symbols, one file per symbol and day.
+
+    The frame is converted to Arrow once and every partition is written from
+    rows taken out of that table, instead of a pandas group and a fresh
+    conversion per partition. ``schema`` (without ``symbol``, which is kept
+    in the path) is used as given instead of being inferred.
+    """
+    s = get_settings()
+    base_path = base or s.LOCAL_STORAGE_BASE
+    if df.empty:
+        return {"written": 0, "partitions": []}
+    timestamps = _utc_timestamps(df)
+    table = _to_table(df.drop(columns=["symbol"]).assign(timestamp=timestamps), schema)
+    groups = df.groupby([df["symbol"], timestamps.dt.date], sort=False, observed=True).indices
+    # Rows go out in time order, so each row group's timestamp min/max stay
+    # tight and range reads can skip the row groups outside their window
+    ts_values = timestamps.to_numpy()
+    partitions = [
+        _write_partition(table.take(pa.array(rows[np.argsort(ts_values[rows], kind="stable")])), base_path, symbol, date)
+        for (symbol, date), rows in groups.items()
+    ]
     return {"written": len(partitions), "partitions": partitions}
 
 
@@ -34,24 +105,29 @@ def read_ohlcv_range(symbol: str, start: Optional[str], end: Optional[str], *, b
     base_path = base or s.LOCAL_STORAGE_BASE
     start_ts = pd.Timestamp(start, tz="UTC") if start else None
     end_ts = pd.Timestamp(end, tz="UTC") if end else None
-    # naive scan: iterate dates between start and end
     if not start_ts or not end_ts:
         return pd.DataFrame()
-    days = pd.date_range(start_ts.normalize(), end_ts.normalize(), freq="D")
-    frames = []
-    for day in days:
-        p = ohlcv_partition_path(base_path, symbol, day)
-        f = p / "part.parquet"
-        if f.exists():
-            df = pd.read_parquet(f)
-            frames.append(df)
-    if not frames:
+    root = ohlcv_symbol_path(base_path, symbol)
+    if not root.is_dir():
         return pd.DataFrame()
-    df = pd.concat(frames, ignore_index=True)
-    mask = pd.Series(True, index=df.index)
-    if start_ts is not None:
-        mask &= pd.to_datetime(df["timestamp"], utc=True) >= start_ts
-    if end_ts is not None:
-        mask &= pd.to_datetime(df["timestamp"], utc=True) <= end_ts
-    return df.loc[mask]
-
+    # Single dataset scan: the date filter prunes partition directories and the
+    # timestamp filter is pushed down to parquet row-group statistics
+    dataset = ds.dataset(root, format="parquet", partitioning=_DATE_PARTITIONING)
+    ts_type = dataset.schema.field("timestamp").type
+    expr = (
+        (ds.field("date") >= start_ts.strftime("%Y-%m-%d"))
+        & (ds.field("date") <= end_ts.strftime("%Y-%m-%d"))
+        & (ds.field("timestamp") >= pa.scalar(start_ts, type=ts_type))
+        & (ds.field("timestamp") <= pa.scalar(end_ts, type=ts_type))
+    )
+    columns = [name for name in dataset.schema.names if name != "date"]
+    table = dataset.to_table(columns=columns, filter=expr)
+    if table.num_rows == 0:
+        return pd.DataFrame()
+    df = table.to_pandas()
+    # Restore the symbol column dropped at write time (older partitions still carry it)
+    if "symbol" in df.columns:
+        df["symbol"] = df["symbol"].fillna(symbol)
+    else:
+        df.insert(min(list(OHLCV_SCHEMA).index("symbol"), len(df.columns)), "symbol", symbol)
+    return df
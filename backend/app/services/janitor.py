@@ -1,10 +1,11 @@
 from __future__ import annotations
 from datetime import datetime, timedelta
 from typing import Dict, Any, List
+import time
 
 from app.core.config import get_settings
-from app.services.costs import _costs, clear as clear_costs
-from app.services.datastore import ds_clear, _backends  # type: ignore
+from app.services.costs import clear as clear_costs, pop_stale
+from app.services.datastore import ds_clear
 
 
 def purge_trace(trace_id: str) -> Dict[str, Any]:
@@ -21,14 +22,10 @@ def janitor_run(max_age_hours: int | None = None) -> Dict[str, Any]:
     now = datetime.utcnow()
     cutoff = now - timedelta(hours=threshold_hours)
     purged: List[str] = []
-    # Use costs bucket timestamps as a heuristic of last update time
-    for trace_id, entry in list(_costs.items()):
-        try:
-            updated_at = datetime.fromisoformat(entry.get("updated_at"))
-        except Exception:
-            continue
-        if updated_at < cutoff:
-            purge_trace(trace_id)
-            purged.append(trace_id)
+    # Use costs bucket timestamps as a heuristic of last update time; the
+    # index yields only the expired traces, oldest first
+    for trace_id in pop_stale(time.time() - threshold_hours * 3600):
+        purge_trace(trace_id)
+        purged.append(trace_id)
     return {"enabled": True, "purged": purged, "cutoff": cutoff.isoformat()}
 
@@ -1,29 +1,44 @@
 """Simple in-memory KV store and registry placeholder.
 
 Replace with Redis/DB-backed implementations later.
+
+Both stores are split into shards selected by key hash. Reads are a single
+dict lookup with no lock; writes take only their shard's lock.
 """
-from typing import Dict, Any
+from threading import Lock
+from typing import Dict, Any, List
+
+_SHARDS = 16
+
+_kv: List[Dict[str, Any]] = [{} for _ in range(_SHARDS)]
+_kv_locks: List[Lock] = [Lock() for _ in range(_SHARDS)]
+_agents: List[Dict[str, Dict[str, Any]]] = [{} for _ in range(_SHARDS)]
+_agent_locks: List[Lock] = [Lock() for _ in range(_SHARDS)]
 
-_kv: Dict[str, Any] = {}
-_agents: Dict[str, Dict[str, Any]] = {}
+
+def _shard(key: str) -> int:
+    return hash(key) & (_SHARDS - 1)
 
 
 def kv_set(key: str, value: Any) -> None:
-    _kv[key] = value
+    i = _shard(key)
+    with _kv_locks[i]:
+        _kv[i][key] = value
 
 
 def kv_get(key: str, default=None):
-    return _kv.get(key, default)
+    return _kv[_shard(key)].get(key, default)
 
 
 def register_agent(agent_id: str, info: Dict[str, Any]) -> None:
-    _agents[agent_id] = info
+    i = _shard(agent_id)
+    with _agent_locks[i]:
+        _agents[i][agent_id] = info
 
 
 def get_agent(agent_id: str) -> Dict[str, Any] | None:
-    return _agents.get(agent_id)
+    return _agents[_shard(agent_id)].get(agent_id)
 
 
 def list_agents() -> Dict[str, Dict[str, Any]]:
-    return _agents
-
+    return {k: v for shard in _agents for k, v in shard.items()}
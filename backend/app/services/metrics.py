@@ -7,12 +7,47 @@ import pandas as pd
 import numpy as np
 from typing import Dict, Optional
 import logging
+import math
 from app.core.config import get_settings
+from app.services._njit import njit
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
 
+@njit(cache=True, nogil=True)
+def _tail_sharpe(r, window, periods_per_year):
+    """Annualized Sharpe of the last ``window`` returns (sample std, NaN-propagating)"""
+    tail = r[r.shape[0] - window:]
+    total = 0.0
+    for v in tail:
+        total += v
+    mean = total / window
+    ss = 0.0
+    for v in tail:
+        ss += (v - mean) * (v - mean)
+    std = math.sqrt(ss / (window - 1))
+    return mean / (std + 1e-12) * math.sqrt(periods_per_year)
+
+
+def _drawdown_curve(returns: pd.Series) -> np.ndarray:
+    """Drawdown from the running peak of compounded returns at each period"""
+    cumulative = (1 + returns).cumprod().to_numpy(dtype=np.float64)
+    running_max = np.fmax.accumulate(cumulative)
+    return (cumulative - running_max) / running_max
+
+
+def _longest_true_run(mask: np.ndarray) -> int:
+    """Length of the longest run of consecutive True values in a boolean array"""
+    if not mask.any():
+        return 0
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.diff(padded.astype(np.int8))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return int((ends - starts).max())
+
+
 class PerformanceMetrics:
     """
     Calculate trading strategy performance metrics
@@ -143,12 +178,9 @@ class PerformanceMetrics:
         if len(returns) == 0:
             return 0.0
         
-        cumulative = (1 + returns).cumprod()
-        running_max = cumulative.expanding().max()
-        drawdown = (cumulative - running_max) / running_max
-        
-        max_dd = drawdown.min()
-        return float(max_dd)
+        # fmin/fmax skip NaN the way pandas min/expanding max do
+        drawdown = _drawdown_curve(returns)
+        return float(np.fmin.reduce(drawdown))
     
     @staticmethod
     def max_drawdown_duration(returns: pd.Series) -> int:
@@ -164,25 +196,8 @@ class PerformanceMetrics:
         if len(returns) == 0:
             return 0
         
-        cumulative = (1 + returns).cumprod()
-        running_max = cumulative.expanding().max()
-        drawdown = (cumulative - running_max) / running_max
-        
-        # Find periods in drawdown
-        in_drawdown = drawdown < 0
-        
-        # Calculate consecutive drawdown periods
-        max_duration = 0
-        current_duration = 0
-        
-        for is_dd in in_drawdown:
-            if is_dd:
-                current_duration += 1
-                max_duration = max(max_duration, current_duration)
-            else:
-                current_duration = 0
-        
-        return int(max_duration)
+        # Longest run of consecutive periods in drawdown
+        return _longest_true_run(_drawdown_curve(returns) < 0)
     
     @staticmethod
     def win_rate(trade_returns: pd.Series) -> float:
@@ -292,6 +307,58 @@ class PerformanceMetrics:
         calmar = annual_return / max_dd
         return float(calmar)
     
+    def _return_metrics(self, r: np.ndarray) -> Dict[str, float]:
+        """
+        Period-return metrics from one set of shared intermediates
+        
+        Equivalent to calling the individual metric methods, but the mean,
+        standard deviations, compounded growth and drawdown curve are each
+        computed once instead of once per metric.
+        
+        Args:
+            r: Non-empty, NaN-free array of period returns
+            
+        Returns:
+            Dictionary with the return/risk metrics of calculate_all_metrics
+        """
+        n = r.shape[0]
+        ppy = self.periods_per_year
+        
+        growth = np.cumprod(1.0 + r)
+        total = growth[-1]
+        years = n / ppy
+        annual_return = float(total ** (1 / years) - 1) if years > 0 and total > 0 else 0.0
+        
+        running_max = np.maximum.accumulate(growth)
+        drawdown = (growth - running_max) / running_max
+        max_dd = float(drawdown.min())
+        
+        volatility = sharpe = sortino = 0.0
+        if n > 1:
+            sd = r.std(ddof=1)
+            excess = r - (self.risk_free_rate / ppy)
+            excess_mean = excess.mean()
+            volatility = float(sd * np.sqrt(ppy))
+            if sd != 0:
+                sharpe = float(np.sqrt(ppy) * excess_mean / sd)
+            downside = excess[excess < 0]
+            if downside.size:
+                # Single downside period has undefined sample std, as in pandas
+                downside_sd = downside.std(ddof=1) if downside.size > 1 else np.nan
+                if downside_sd != 0:
+                    sortino = float(np.sqrt(ppy) * excess_mean / downside_sd)
+        
+        return {
+            'total_return': float(total - 1),
+            'annualized_return': annual_return,
+            'volatility': volatility,
+            'sharpe_ratio': sharpe,
+            'sortino_ratio': sortino,
+            'maximum_drawdown': max_dd,
+            'max_drawdown_duration': _longest_true_run(drawdown < 0),
+            'calmar_ratio': float(annual_return / abs(max_dd)) if max_dd != 0 else 0.0,
+        }
+    
     def calculate_all_metrics(
         self,
         returns: pd.Series,
@@ -312,16 +379,20 @@ class PerformanceMetrics:
         logger.info(f"Calculating performance metrics for {len(returns)} periods")
         
         # Basic returns metrics
-        metrics = {
-            'total_return': self.total_return(returns),
-            'annualized_return': self.annualized_return(returns, self.periods_per_year),
-            'volatility': self.volatility(returns, self.periods_per_year),
-            'sharpe_ratio': self.sharpe_ratio(returns),
-            'sortino_ratio': self.sortino_ratio(returns),
-            'maximum_drawdown': self.maximum_drawdown(returns),
-            'max_drawdown_duration': self.max_drawdown_duration(returns),
-            'calmar_ratio': self.calmar_ratio(returns, self.periods_per_year),
-        }
+        r = returns.to_numpy(dtype=np.float64)
+        if len(r) and not np.isnan(r).any():
+            metrics = self._return_metrics(r)
+        else:
+            metrics = {
+                'total_return': self.total_return(returns),
+                'annualized_return': self.annualized_return(returns, self.periods_per_year),
+                'volatility': self.volatility(returns, self.periods_per_year),
+                'sharpe_ratio': self.sharpe_ratio(returns),
+                'sortino_ratio': self.sortino_ratio(returns),
+                'maximum_drawdown': self.maximum_drawdown(returns),
+                'max_drawdown_duration': self.max_drawdown_duration(returns),
+                'calmar_ratio': self.calmar_ratio(returns, self.periods_per_year),
+            }
         
         # Calculate final capital
         final_capital = initial_capital * (1 + metrics['total_return'])
@@ -355,9 +426,11 @@ class PerformanceMetrics:
         # Rolling Sharpe (30 periods) if enough data
         try:
             if len(returns) >= 30:
-                roll = returns.rolling(30)
-                roll_sharpe = (roll.mean() / (roll.std() + 1e-12)) * np.sqrt(self.periods_per_year)
-                metrics['rolling_sharpe_30'] = float(roll_sharpe.iloc[-1]) if not np.isnan(roll_sharpe.iloc[-1]) else 0.0
+                # Only the latest window is reported, so skip the full rolling series
+                tail_sharpe = _tail_sharpe(
+                    returns.to_numpy(dtype=np.float64), 30, float(self.periods_per_year)
+                )
+                metrics['rolling_sharpe_30'] = float(tail_sharpe) if not np.isnan(tail_sharpe) else 0.0
         except Exception:
             metrics['rolling_sharpe_30'] = 0.0
 
@@ -0,0 +1,76 @@
+"""
+Compiled OHLCV bar aggregation
+
+``ohlcv_bars`` reduces runs of consecutive rows into bars in one pass over
+the five price/volume arrays, matching pandas' ``first``/``max``/``min``/
+``last``/``sum`` reducers: NaNs are skipped, and sums use the same Kahan
+compensation so results agree bit for bit. Only useful with numba installed;
+callers check ``NUMBA_AVAILABLE`` and resample with pandas otherwise.
+"""
+from typing import Tuple
+
+import numpy as np
+
+from app.services._njit import NUMBA_AVAILABLE, njit, prange
+
+__all__ = ["NUMBA_AVAILABLE", "ohlcv_bars"]
+
+
+@njit(parallel=True, cache=True, nogil=True)
+def _ohlcv_agg(open_, high, low, close, volume, starts):
+    m = starts.shape[0] - 1
+    out = np.full((5, m), np.nan)
+    for g in prange(m):
+        o = h = lo = c = np.nan
+        total = 0.0
+        comp = 0.0
+        for i in range(starts[g], starts[g + 1]):
+            x = open_[i]
+            if o != o:
+                o = x
+            x = high[i]
+            if x == x and not (h >= x):
+                h = x
+            x = low[i]
+            if x == x and not (lo <= x):
+                lo = x
+            x = close[i]
+            if x == x:
+                c = x
+            x = volume[i]
+            if x == x:
+                y = x - comp
+                t = total + y
+                comp = t - total - y
+                if comp != comp:
+                    comp = 0.0
+                total = t
+        out[0, g] = o
+        out[1, g] = h
+        out[2, g] = lo
+        out[3, g] = c
+        out[4, g] = total
+    return out
+
+
+def ohlcv_bars(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+    starts: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Aggregate rows into bars
+
+    Args:
+        open_, high, low, close, volume: float64 arrays of equal length
+        starts: int64 row offsets where each bar begins, followed by the
+            total row count
+
+    Returns:
+        open, high, low, close and volume arrays with one value per bar
+    """
+    out = _ohlcv_agg(open_, high, low, close, volume, starts)
+    return out[0], out[1], out[2], out[3], out[4]
@@ -5,19 +5,290 @@ Automatically tweaks and improves trading strategies through systematic paramete
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 import logging
+import multiprocessing
+import os
 from datetime import datetime
+import hashlib
+import heapq
 import itertools
 import json
+import math
+import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from string import Template
 
+from app.core.config import get_settings
+from app.services._njit import NUMBA_AVAILABLE
 from app.services.backtester import VectorizedBacktester
 from app.services.data_fetcher import MarketDataFetcher
 from app.services.prebuilt_strategies import PrebuiltStrategies
-from app.utils.exceptions import BacktestError
+from app.utils.exceptions import BacktestError, BacktestPruned
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - orjson is optional
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Below this many combinations pool start-up costs more than it saves
+_MIN_PARALLEL_COMBINATIONS = 8
+
+# Backtest outcomes remembered per optimizer, keyed by data and config
+_BACKTEST_CACHE_SIZE = 1024
+
+# Market data of a pool worker process, set once by _init_worker
+_worker_market_data: Optional[pd.DataFrame] = None
+
+# Shared pruning bound of a pool worker process (-inf while unset)
+_worker_prune_bound = None
+
+
+def _json_bytes(obj: Any, sort_keys: bool = False) -> bytes:
+    """
+    Serialize ``obj`` to JSON, with orjson when installed
+    
+    Unserializable values fall back to ``str`` as with ``default=str``.
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, default=str, option=option)
+    return json.dumps(obj, sort_keys=sort_keys, default=str).encode()
+
+
+# Candidate Latin hypercube designs drawn; the most spread-out one is used.
+# Scoring is O(n^2) in memory, so larger designs use the first draw.
+_LHS_CANDIDATES = 10
+_LHS_MAXIMIN_MAX_POINTS = 500
+
+
+def _latin_hypercube(n: int, d: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Latin hypercube sample of ``n`` points in [0, 1)^d
+    
+    Each dimension is split into ``n`` equal strata with exactly one point
+    per stratum. Of several random designs, the one with the largest minimum
+    pairwise distance (maximin) is returned.
+    """
+    best, best_dist = None, -1.0
+    candidates = _LHS_CANDIDATES if n <= _LHS_MAXIMIN_MAX_POINTS else 1
+    for _ in range(candidates):
+        strata = np.argsort(rng.random((d, n)), axis=1).T
+        design = (strata + rng.random((n, d))) / n
+        if candidates == 1:
+            return design
+        diff = design[:, None, :] - design[None, :, :]
+        dist = np.sqrt((diff ** 2).sum(axis=-1))
+        min_dist = dist[np.triu_indices(n, k=1)].min() if n > 1 else 0.0
+        if min_dist > best_dist:
+            best, best_dist = design, min_dist
+    return best
+
+
+# Grids with more points than this cannot be indexed with int64
+_MAX_FLAT_GRID = 2**62
+
+# Successive halving: left-aligned fractions of the data backtested before
+# the full run, and the trades a candidate needs on a slice to be pruned
+_HALVING_FRACTIONS = (0.125, 0.25, 0.5)
+_HALVING_MIN_TRADES = 3
+
+
+def _decode_grid_indices(flat: np.ndarray, sizes: List[int]) -> np.ndarray:
+    """
+    Per-parameter grid positions of flat indices into the parameter product
+    
+    Uses itertools.product ordering (last parameter varies fastest); returns
+    an array of shape (len(flat), len(sizes)).
+    """
+    sizes_arr = np.asarray(sizes, dtype=np.int64)
+    strides = np.ones_like(sizes_arr)
+    strides[:-1] = np.cumprod(sizes_arr[::-1])[::-1][1:]
+    return (flat[:, None] // strides) % sizes_arr
+
+
+class _PreparedMarket:
+    """
+    Market data converted once and shared by every backtest of a sweep
+    
+    Holds the frame itself, its content fingerprint (for the backtest cache)
+    and its columns as arrays (for pool workers), so repeated optimizer runs
+    on the same data, e.g. across autonomous_improve generations, skip
+    re-hashing and re-converting it.
+    """
+    __slots__ = ('data', 'key', 'columns', '_prefixes')
+    
+    def __init__(self, data: pd.DataFrame, key: bytes, columns: Dict[str, np.ndarray]):
+        self.data = data
+        self.key = key
+        self.columns = columns
+        self._prefixes: Dict[int, '_PreparedMarket'] = {}
+    
+    @classmethod
+    def from_frame(cls, market_data: pd.DataFrame) -> '_PreparedMarket':
+        hashed = pd.util.hash_pandas_object(market_data, index=True).to_numpy()
+        names = _json_bytes([str(c) for c in market_data.columns])
+        key = hashlib.blake2b(hashed.tobytes() + names, digest_size=16).digest()
+        columns = {name: market_data[name].to_numpy() for name in market_data.columns}
+        return cls(market_data, key, columns)
+    
+    def prefix(self, rows: int) -> '_PreparedMarket':
+        """The first ``rows`` rows, prepared once and kept for later sweeps"""
+        if rows not in self._prefixes:
+            self._prefixes[rows] = _PreparedMarket.from_frame(self.data.iloc[:rows])
+        return self._prefixes[rows]
+
+
+@lru_cache(maxsize=256)
+def _threshold_template(condition: str, literal: str) -> Template:
+    """
+    Rule condition with each standalone ``literal`` number as a $value placeholder
+    
+    Only whole numeric tokens match, so identifiers such as RSI_30 or other
+    numbers containing the literal are left alone. Parsed once per condition.
+    """
+    pattern = rf'(?<![\w.]){re.escape(literal)}(?![\w.])'
+    return Template(re.sub(pattern, '${value}', condition.replace('$', '$$')))
+
+
+# Parameter name fragment -> (indicator types, field set, cast, filter on
+# the indicator). Order matters: a parameter uses the first entry whose
+# fragment it contains and whose types include the indicator's.
+_PARAM_MAP: Tuple[Tuple[str, Tuple[str, ...], str, Any, Any], ...] = (
+    # SMA/EMA parameters; fast and slow SMAs are told apart by period
+    ('SMA_fast_period', ('SMA',), 'period', int, lambda ind: ind.get('period', 0) < 30),
+    ('SMA_slow_period', ('SMA',), 'period', int, lambda ind: ind.get('period', 0) >= 30),
+    # RSI parameters
+    ('RSI_period', ('RSI',), 'period', int, None),
+    # MACD parameters
+    ('MACD_fast', ('MACD',), 'fast_period', int, None),
+    ('MACD_slow', ('MACD',), 'slow_period', int, None),
+    ('MACD_signal', ('MACD',), 'signal_period', int, None),
+    # Bollinger Bands parameters
+    ('BB_period', ('BOLLINGER', 'BB'), 'period', int, None),
+    ('BB_std_dev', ('BOLLINGER', 'BB'), 'num_std', float, None),
+    # EMA parameters
+    ('EMA_short', ('EMA',), 'period', int, lambda ind: ind.get('period', 0) < 20),
+    ('EMA_medium', ('EMA',), 'period', int, lambda ind: 15 <= ind.get('period', 0) < 35),
+    ('EMA_long', ('EMA',), 'period', int, lambda ind: ind.get('period', 0) >= 35),
+)
+
+
+@lru_cache(maxsize=256)
+def _param_targets(param_name: str) -> Dict[str, Tuple[str, Any, Any]]:
+    """Indicator type -> (field, cast, filter) a parameter sets, resolved once per name"""
+    targets: Dict[str, Tuple[str, Any, Any]] = {}
+    for fragment, indicator_types, field, cast, accepts in _PARAM_MAP:
+        if fragment in param_name:
+            for indicator_type in indicator_types:
+                targets.setdefault(indicator_type, (field, cast, accepts))
+    return targets
+
+
+class _PruneBound:
+    """
+    Partial Sharpe ratio a backtest must reach to stay in a sweep
+    
+    Tracks the best ``top_n`` full-data Sharpe ratios seen so far; once
+    there are that many, backtests whose first-half Sharpe falls more than
+    ``margin`` below the weakest of them are abandoned. The bound is
+    mirrored into ``shared`` for pool workers when set.
+    """
+    __slots__ = ('top_n', 'margin', 'shared', '_heap')
+    
+    def __init__(self, top_n: int, margin: float):
+        self.top_n = max(top_n, 1)
+        self.margin = margin
+        self.shared = None
+        self._heap: List[float] = []
+    
+    @property
+    def value(self) -> Optional[float]:
+        if len(self._heap) < self.top_n:
+            return None
+        return self._heap[0] - self.margin
+    
+    def add(self, entry: Optional[Dict]) -> None:
+        """Account for a finished backtest's result entry"""
+        if entry is None:
+            return
+        score = entry['metrics'].get('sharpe_ratio')
+        if score is None or np.isnan(score):
+            return
+        if len(self._heap) < self.top_n:
+            heapq.heappush(self._heap, score)
+        elif score > self._heap[0]:
+            heapq.heapreplace(self._heap, score)
+        else:
+            return
+        if self.shared is not None and self.value is not None:
+            self.shared.value = self.value
+
+
+def _init_worker(columns: Dict[str, np.ndarray], index: pd.Index, prune_bound=None) -> None:
+    """Rebuild the market data once per worker instead of pickling it per task"""
+    global _worker_market_data, _worker_prune_bound
+    _worker_market_data = pd.DataFrame(columns, index=index, copy=False)
+    _worker_prune_bound = prune_bound
+
+
+def _run_combination(
+    market_data: pd.DataFrame,
+    task: Tuple,
+    min_partial_sharpe: Optional[float] = None
+) -> Tuple[int, Optional[Dict], bool]:
+    """
+    Backtest one parameter combination
+    
+    Args:
+        market_data: Historical market data
+        task: (position, parameters, strategy config, initial capital,
+            commission rate, slippage rate)
+        min_partial_sharpe: First-half Sharpe ratio below which the backtest
+            is abandoned
+        
+    Returns:
+        The task position, its result entry or None if the backtest failed
+        or was abandoned, and whether it was abandoned
+    """
+    i, params, config, initial_capital, commission_rate, slippage_rate = task
+    try:
+        # The shared frame is never mutated, so skip the defensive copy
+        backtester = VectorizedBacktester(
+            market_data,
+            initial_capital,
+            commission_rate,
+            slippage_rate,
+            copy_data=False
+        )
+        backtest_result = backtester.run_backtest(config, min_partial_sharpe=min_partial_sharpe)
+    except BacktestPruned:
+        return i, None, True
+    except Exception as e:
+        logger.warning(f"Backtest failed for params {params}: {str(e)}")
+        return i, None, False
+    
+    if not backtest_result['success']:
+        return i, None, False
+    return i, {
+        'parameters': params,
+        'metrics': backtest_result['metrics'],
+        'num_trades': backtest_result['num_trades'],
+        'config': config
+    }, False
+
+
+def _run_one(task: Tuple) -> Tuple[int, Optional[Dict], bool]:
+    """Pool entry point: backtest ``task`` against the worker's market data"""
+    bound = None
+    if _worker_prune_bound is not None and _worker_prune_bound.value > -np.inf:
+        bound = _worker_prune_bound.value
+    return _run_combination(_worker_market_data, task, bound)
+
 
 class StrategyOptimizer:
     """
@@ -33,7 +304,8 @@ class StrategyOptimizer:
         self,
         initial_capital: float = 100000.0,
         commission_rate: float = 0.001,
-        slippage_rate: float = 0.0005
+        slippage_rate: float = 0.0005,
+        seed: Optional[int] = None
     ):
         """
         Initialize optimizer
@@ -42,10 +314,15 @@ class StrategyOptimizer:
             initial_capital: Starting capital for backtests
             commission_rate: Commission per trade
             slippage_rate: Slippage per trade
+            seed: Seed for parameter sampling; None draws fresh entropy
         """
         self.initial_capital = initial_capital
         self.commission_rate = commission_rate
         self.slippage_rate = slippage_rate
+        # One generator for all sampling, so a seeded optimizer reproduces
+        # every sweep, e.g. across autonomous_improve generations
+        self._rng = np.random.default_rng(seed)
+        self._bt_cache: "OrderedDict[bytes, Optional[Dict]]" = OrderedDict()
         
     def optimize_strategy(
         self,
@@ -53,7 +330,10 @@ class StrategyOptimizer:
         market_data: pd.DataFrame,
         optimization_metric: str = 'sharpe_ratio',
         max_iterations: int = 50,
-        top_n: int = 5
+        top_n: int = 5,
+        prepared_market: Optional[_PreparedMarket] = None,
+        successive_halving: bool = False,
+        prune_margin: Optional[float] = None
     ) -> Dict:
         """
         Optimize a strategy by testing parameter variations
@@ -64,9 +344,19 @@ class StrategyOptimizer:
             optimization_metric: Metric to optimize ('sharpe_ratio', 'total_return', 'win_rate')
             max_iterations: Maximum number of variations to test
             top_n: Number of top strategies to return
+            prepared_market: Conversion of ``market_data`` to reuse across calls
+            successive_halving: Prune candidates on growing prefixes of the
+                data before backtesting the survivors on all of it
+            prune_margin: Abandon backtests whose first-half Sharpe ratio is
+                this far below the current top N (sharpe_ratio only;
+                default: None, never abandon)
             
         Returns:
-            Dictionary with optimization results
+            Dictionary with optimization results. ``total_tested`` counts
+            every candidate backtested, including those ``eliminated`` by
+            successive halving and those ``abandoned`` by pruning;
+            ``top_strategies`` and ``statistics`` cover the candidates
+            backtested on all of the data.
         """
         try:
             logger.info(f"Starting strategy optimization (max iterations: {max_iterations})")
@@ -87,53 +377,58 @@ class StrategyOptimizer:
             
             logger.info(f"Generated {len(param_combinations)} parameter combinations")
             
-            # Test each combination
-            results = []
-            for i, params in enumerate(param_combinations):
-                try:
-                    # Create modified strategy config
-                    modified_config = self._apply_parameters(strategy_config, params)
-                    
-                    # Run backtest
-                    backtester = VectorizedBacktester(
-                        market_data,
-                        self.initial_capital,
-                        self.commission_rate,
-                        self.slippage_rate
-                    )
-                    
-                    backtest_result = backtester.run_backtest(modified_config['config'])
-                    
-                    # Store results
-                    if backtest_result['success']:
-                        results.append({
-                            'parameters': params,
-                            'metrics': backtest_result['metrics'],
-                            'num_trades': backtest_result['num_trades'],
-                            'config': modified_config['config']
-                        })
-                    
-                    if (i + 1) % 10 == 0:
-                        logger.info(f"Completed {i + 1}/{len(param_combinations)} backtests")
-                        
-                except Exception as e:
-                    logger.warning(f"Backtest failed for params {params}: {str(e)}")
-                    continue
-            
-            # Sort by optimization metric
-            results.sort(
-                key=lambda x: x['metrics'].get(optimization_metric, -float('inf')),
-                reverse=True
+            if prepared_market is None:
+                prepared_market = _PreparedMarket.from_frame(market_data)
+            
+            candidates = list(range(len(param_combinations)))
+            eliminated = 0
+            if successive_halving:
+                candidates = self._successive_halving(
+                    strategy_config,
+                    param_combinations,
+                    prepared_market,
+                    optimization_metric,
+                    top_n
+                )
+                # Only judged candidates are dropped, so each was backtested
+                eliminated = len(param_combinations) - len(candidates)
+            
+            prune = None
+            if prune_margin is not None and optimization_metric == 'sharpe_ratio':
+                prune = _PruneBound(top_n, prune_margin)
+            
+            outcomes, abandoned = self._backtest_combinations(
+                strategy_config,
+                param_combinations,
+                candidates,
+                prepared_market,
+                prune
             )
             
-            # Get top N results
-            top_results = results[:top_n]
+            # Column layout: one score per successful backtest plus references
+            # to its entry; full result dicts are built for the top N only
+            tested = [(i, entry) for i, entry in outcomes.items() if entry is not None]
+            # One pass over the results collects each metric and whether the
+            # backtest reported it at all (missing counts as 0.0 in the stats)
+            collected = np.fromiter(
+                (
+                    (entry['metrics'].get(optimization_metric, 0.0), optimization_metric in entry['metrics'])
+                    for _, entry in tested
+                ),
+                dtype=[('value', np.float64), ('present', np.bool_)],
+                count=len(tested)
+            )
+            metric_values, has_metric = collected['value'], collected['present']
+            # Missing or NaN metrics rank last
+            scores = np.where(has_metric & ~np.isnan(metric_values), metric_values, -np.inf)
+            
+            top_results = [
+                {**tested[j][1], 'parameters': param_combinations[tested[j][0]]}
+                for j in self._top_indices(scores, top_n)
+            ]
             
             # Calculate statistics
-            optimization_stats = self._calculate_optimization_stats(
-                results,
-                optimization_metric
-            )
+            optimization_stats = self._calculate_optimization_stats(metric_values)
             
             execution_time = (datetime.now() - start_time).total_seconds()
             
@@ -144,7 +439,9 @@ class StrategyOptimizer:
                 'success': True,
                 'base_strategy': strategy_config.get('name', 'Custom Strategy'),
                 'optimization_metric': optimization_metric,
-                'total_tested': len(results),
+                'total_tested': len(tested) + eliminated + len(abandoned),
+                'eliminated': eliminated,
+                'abandoned': len(abandoned),
                 'top_strategies': top_results,
                 'statistics': optimization_stats,
                 'execution_time': execution_time
@@ -157,6 +454,243 @@ class StrategyOptimizer:
                 'error': str(e)
             }
     
+    def _backtest_combinations(
+        self,
+        strategy_config: Dict,
+        param_combinations: List[Dict],
+        candidates: List[int],
+        market: _PreparedMarket,
+        prune: Optional[_PruneBound] = None
+    ) -> Tuple[Dict[int, Optional[Dict]], Set[int]]:
+        """
+        Backtest the selected parameter combinations on the prepared data
+        
+        Configs already backtested on this data are taken from the cache
+        (grid snapping and later generations repeat them).
+        
+        Args:
+            strategy_config: Base strategy configuration
+            param_combinations: All generated parameter combinations
+            candidates: Positions in ``param_combinations`` to backtest
+            market: Prepared historical market data
+            prune: Bound for abandoning hopeless backtests early
+            
+        Returns:
+            Result entry per candidate position in ascending order, None where
+            the backtest failed or was abandoned (candidates whose config
+            could not be built are left out), and the abandoned positions
+        """
+        combo_keys: Dict[int, bytes] = {}
+        outcomes: Dict[bytes, Optional[Dict]] = {}
+        pending: Dict[bytes, int] = {}
+        tasks = []
+        for i in sorted(candidates):
+            params = param_combinations[i]
+            try:
+                # Create modified strategy config
+                modified_config = self._apply_parameters(strategy_config, params)
+            except Exception as e:
+                logger.warning(f"Backtest failed for params {params}: {str(e)}")
+                continue
+            key = self._config_key(market.key, modified_config['config'])
+            combo_keys[i] = key
+            if key in outcomes or key in pending:
+                continue
+            if key in self._bt_cache:
+                self._bt_cache.move_to_end(key)
+                outcomes[key] = self._bt_cache[key]
+                if prune is not None:
+                    prune.add(outcomes[key])
+                continue
+            pending[key] = i
+            tasks.append((
+                i,
+                params,
+                modified_config['config'],
+                self.initial_capital,
+                self.commission_rate,
+                self.slippage_rate
+            ))
+        
+        completed, abandoned = self._run_backtests(tasks, market, prune)
+        abandoned_keys = set()
+        for key, i in pending.items():
+            outcomes[key] = completed.get(i)
+            # Abandoning depends on the sweep's bound, so it is not an outcome
+            if i in abandoned:
+                abandoned_keys.add(key)
+            else:
+                self._remember_backtest(key, outcomes[key])
+        
+        return (
+            {i: outcomes[key] for i, key in combo_keys.items()},
+            {i for i, key in combo_keys.items() if key in abandoned_keys}
+        )
+    
+    def _successive_halving(
+        self,
+        strategy_config: Dict,
+        param_combinations: List[Dict],
+        market: _PreparedMarket,
+        optimization_metric: str,
+        top_n: int
+    ) -> List[int]:
+        """
+        Prune parameter combinations on growing prefixes of the data
+        
+        Every stage backtests the survivors on the same left-aligned slice
+        and keeps the better half of those it could judge (never fewer than
+        ``top_n``). Candidates that fail on a slice or trade fewer than
+        _HALVING_MIN_TRADES times have not been judged yet and always survive.
+        
+        Args:
+            strategy_config: Base strategy configuration
+            param_combinations: All generated parameter combinations
+            market: Prepared historical market data
+            optimization_metric: Metric to rank candidates by
+            top_n: Number of top strategies to return
+            
+        Returns:
+            Positions in ``param_combinations`` to backtest on all the data
+        """
+        survivors = list(range(len(param_combinations)))
+        n_rows = len(market.data)
+        
+        for fraction in _HALVING_FRACTIONS:
+            rows = int(n_rows * fraction)
+            if len(survivors) <= top_n or rows == 0:
+                continue
+            
+            outcomes, _ = self._backtest_combinations(
+                strategy_config,
+                param_combinations,
+                survivors,
+                market.prefix(rows)
+            )
+            scores = self._early_scores(
+                [outcomes.get(i) for i in survivors],
+                optimization_metric
+            )
+            
+            judged = np.flatnonzero(~np.isnan(scores))
+            keep = max(top_n, judged.size // 2)
+            ranked = judged[self._top_indices(scores[judged], judged.size)]
+            dropped = set(ranked[keep:].tolist())
+            survivors = [i for j, i in enumerate(survivors) if j not in dropped]
+            logger.info(f"Successive halving on {rows} rows kept {len(survivors)} candidates")
+        
+        return survivors
+    
+    @staticmethod
+    def _early_scores(entries: List[Optional[Dict]], optimization_metric: str) -> np.ndarray:
+        """
+        Score candidates backtested on a slice of the data
+        
+        NaN marks candidates that cannot be judged yet: failed backtests and
+        those with too few trades for the metric to mean anything. Missing
+        or NaN metrics of judged candidates rank last.
+        """
+        scores = np.full(len(entries), np.nan)
+        for j, entry in enumerate(entries):
+            if entry is None or entry['num_trades'] < _HALVING_MIN_TRADES:
+                continue
+            value = entry['metrics'].get(optimization_metric, np.nan)
+            scores[j] = -np.inf if value is None or np.isnan(value) else value
+        return scores
+    
+    @staticmethod
+    def _config_key(data_key: bytes, config: Dict) -> bytes:
+        """Cache key of a strategy config backtested on the fingerprinted data"""
+        canonical = _json_bytes(config, sort_keys=True)
+        return hashlib.blake2b(data_key + canonical, digest_size=16).digest()
+    
+    def _remember_backtest(self, key: bytes, entry: Optional[Dict]) -> None:
+        """Store a backtest outcome (None for a failed run), evicting the oldest"""
+        self._bt_cache[key] = entry
+        self._bt_cache.move_to_end(key)
+        while len(self._bt_cache) > _BACKTEST_CACHE_SIZE:
+            self._bt_cache.popitem(last=False)
+    
+    def _run_backtests(
+        self,
+        tasks: List[Tuple],
+        market: _PreparedMarket,
+        prune: Optional[_PruneBound] = None
+    ) -> Tuple[Dict[int, Optional[Dict]], Set[int]]:
+        """
+        Backtest every task, across a worker pool when worthwhile
+        
+        Runs serially unless OPTIMIZER_WORKERS opts in to more workers (0 for
+        one per core): sweeps run inside request handlers, where forking a
+        pool of the whole server per call is not a safe default. Workers are
+        processes, or threads sharing the market data when OPTIMIZER_EXECUTOR
+        is "thread" and the numba kernels, compiled to release the GIL, are
+        available.
+        
+        Args:
+            tasks: Argument tuples for _run_combination
+            market: Prepared historical market data
+            prune: Bound for abandoning hopeless backtests early, raised as
+                results come in
+            
+        Returns:
+            Result entry per task position, None where the backtest failed or
+            was abandoned, and the positions of the abandoned tasks
+        """
+        settings = get_settings()
+        requested = settings.OPTIMIZER_WORKERS
+        workers = min(requested if requested > 0 else os.cpu_count() or 1, len(tasks))
+        use_threads = settings.OPTIMIZER_EXECUTOR == 'thread' and NUMBA_AVAILABLE
+        completed: List[Tuple[int, Optional[Dict], bool]] = []
+        
+        def record(done: Tuple[int, Optional[Dict], bool]) -> None:
+            completed.append(done)
+            if prune is not None:
+                prune.add(done[1])
+            if len(completed) % 10 == 0:
+                logger.info(f"Completed {len(completed)}/{len(tasks)} backtests")
+        
+        def run_local(task: Tuple) -> Tuple[int, Optional[Dict], bool]:
+            return _run_combination(market.data, task, prune.value if prune is not None else None)
+        
+        parallel = workers > 1 and len(tasks) >= _MIN_PARALLEL_COMBINATIONS
+        if parallel and use_threads:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for future in as_completed([pool.submit(run_local, task) for task in tasks]):
+                    record(future.result())
+        elif parallel:
+            chunksize = max(1, len(tasks) // (4 * workers))
+            shared_bound = None
+            if prune is not None:
+                # Workers read the bound without locking; a stale value only
+                # means a backtest runs to completion
+                shared_bound = multiprocessing.Value('d', -np.inf, lock=False)
+                bound = prune.value
+                if bound is not None:
+                    shared_bound.value = bound
+                prune.shared = shared_bound
+            try:
+                with multiprocessing.Pool(
+                    processes=workers,
+                    initializer=_init_worker,
+                    initargs=(market.columns, market.data.index, shared_bound)
+                ) as pool:
+                    for done in pool.imap_unordered(_run_one, tasks, chunksize=chunksize):
+                        record(done)
+            except Exception as e:
+                logger.warning(f"Parallel backtests unavailable, running serially: {str(e)}")
+                completed = []
+            finally:
+                if prune is not None:
+                    prune.shared = None
+        
+        if not completed:
+            for task in tasks:
+                record(run_local(task))
+        
+        abandoned = {i for i, _, was_abandoned in completed if was_abandoned}
+        return {i: entry for i, entry, _ in completed}, abandoned
+    
     def _generate_parameter_combinations(
         self,
         optimizable_params: Dict,
@@ -185,26 +719,42 @@ class StrategyOptimizer:
             else:
                 param_ranges[param_name] = list(range(min_val, max_val + step, step))
         
-        # Generate all combinations
         param_names = list(param_ranges.keys())
         param_values = [param_ranges[name] for name in param_names]
         
-        all_combinations = list(itertools.product(*param_values))
+        # Small spaces are enumerated exhaustively
+        if math.prod(len(values) for values in param_values) <= max_combinations:
+            return [dict(zip(param_names, combo)) for combo in itertools.product(*param_values)]
         
-        # Limit combinations
-        if len(all_combinations) > max_combinations:
-            # Sample randomly
-            indices = np.random.choice(
-                len(all_combinations),
-                size=max_combinations,
-                replace=False
-            )
-            all_combinations = [all_combinations[i] for i in indices]
+        # Otherwise sample a Latin hypercube over the grid indices, which
+        # covers every parameter's range evenly without building the product
+        design = _latin_hypercube(max_combinations, len(param_names), self._rng)
         
-        # Convert to list of dictionaries
         combinations = []
-        for combo in all_combinations:
-            combinations.append(dict(zip(param_names, combo)))
+        seen = set()
+        for row in design:
+            combo = tuple(
+                values[min(int(u * len(values)), len(values) - 1)]
+                for u, values in zip(row, param_values)
+            )
+            # Snapping to coarse grids can repeat a point
+            if combo not in seen:
+                seen.add(combo)
+                combinations.append(dict(zip(param_names, combo)))
+        
+        # Top up collisions with distinct grid points drawn as flat indices
+        # into the product and decoded per parameter, never enumerating it
+        sizes = [len(values) for values in param_values]
+        total = math.prod(sizes)
+        if len(combinations) < max_combinations and total < _MAX_FLAT_GRID:
+            flat = self._rng.choice(total, size=max_combinations, replace=False)
+            for row in _decode_grid_indices(flat, sizes):
+                combo = tuple(values[j] for j, values in zip(row, param_values))
+                if combo not in seen:
+                    seen.add(combo)
+                    combinations.append(dict(zip(param_names, combo)))
+                    if len(combinations) == max_combinations:
+                        break
         
         return combinations
     
@@ -219,50 +769,31 @@ class StrategyOptimizer:
         Returns:
             Modified strategy configuration
         """
-        modified_config = json.loads(json.dumps(strategy_config))  # Deep copy
+        # Copy only the parts that get mutated; everything else is shared
+        config = strategy_config['config']
+        modified_config = {
+            **strategy_config,
+            'config': {
+                **config,
+                'indicators': [dict(indicator) for indicator in config['indicators']],
+                **{
+                    rules: dict(config[rules])
+                    for rules in ('entry_rules', 'exit_rules')
+                    if rules in config
+                }
+            }
+        }
         
         # Update indicator parameters
+        indicators_by_type: Dict[str, List[Dict]] = {}
         for indicator in modified_config['config']['indicators']:
-            indicator_type = indicator['type']
-            
-            # Handle different parameter naming patterns
-            for param_name, param_value in parameters.items():
-                # SMA/EMA parameters
-                if 'SMA_fast_period' in param_name and indicator_type == 'SMA':
-                    if indicator.get('period', 0) < 30:  # Assume this is fast SMA
-                        indicator['period'] = int(param_value)
-                elif 'SMA_slow_period' in param_name and indicator_type == 'SMA':
-                    if indicator.get('period', 0) >= 30:  # Assume this is slow SMA
-                        indicator['period'] = int(param_value)
-                
-                # RSI parameters
-                elif 'RSI_period' in param_name and indicator_type == 'RSI':
-                    indicator['period'] = int(param_value)
-                
-                # MACD parameters
-                elif 'MACD_fast' in param_name and indicator_type == 'MACD':
-                    indicator['fast_period'] = int(param_value)
-                elif 'MACD_slow' in param_name and indicator_type == 'MACD':
-                    indicator['slow_period'] = int(param_value)
-                elif 'MACD_signal' in param_name and indicator_type == 'MACD':
-                    indicator['signal_period'] = int(param_value)
-                
-                # Bollinger Bands parameters
-                elif 'BB_period' in param_name and indicator_type in ['BOLLINGER', 'BB']:
-                    indicator['period'] = int(param_value)
-                elif 'BB_std_dev' in param_name and indicator_type in ['BOLLINGER', 'BB']:
-                    indicator['num_std'] = float(param_value)
-                
-                # EMA parameters
-                elif 'EMA_short' in param_name and indicator_type == 'EMA':
-                    if indicator.get('period', 0) < 20:
-                        indicator['period'] = int(param_value)
-                elif 'EMA_medium' in param_name and indicator_type == 'EMA':
-                    if 15 <= indicator.get('period', 0) < 35:
-                        indicator['period'] = int(param_value)
-                elif 'EMA_long' in param_name and indicator_type == 'EMA':
-                    if indicator.get('period', 0) >= 35:
-                        indicator['period'] = int(param_value)
+            indicators_by_type.setdefault(indicator['type'], []).append(indicator)
+        
+        for param_name, param_value in parameters.items():
+            for indicator_type, (field, cast, accepts) in _param_targets(param_name).items():
+                for indicator in indicators_by_type.get(indicator_type, ()):
+                    if accepts is None or accepts(indicator):
+                        indicator[field] = cast(param_value)
         
         # Update entry/exit rule thresholds if applicable
         for param_name, param_value in parameters.items():
@@ -272,41 +803,68 @@ class StrategyOptimizer:
                 exit_condition = modified_config['config']['exit_rules']['condition']
                 
                 if 'oversold' in param_name.lower():
-                    entry_condition = entry_condition.replace('30', str(int(param_value)))
+                    entry_condition = _threshold_template(entry_condition, '30').substitute(value=int(param_value))
                     modified_config['config']['entry_rules']['condition'] = entry_condition
                 elif 'overbought' in param_name.lower():
-                    exit_condition = exit_condition.replace('70', str(int(param_value)))
+                    exit_condition = _threshold_template(exit_condition, '70').substitute(value=int(param_value))
                     modified_config['config']['exit_rules']['condition'] = exit_condition
         
         return modified_config
     
-    def _calculate_optimization_stats(
-        self,
-        results: List[Dict],
-        optimization_metric: str
-    ) -> Dict:
+    @staticmethod
+    def _top_indices(scores: np.ndarray, top_n: int) -> np.ndarray:
+        """
+        Positions of the ``top_n`` highest scores, best first
+        
+        Ties keep their original order, as with a stable descending sort.
+        """
+        n = scores.shape[0]
+        if top_n <= 0 or n == 0:
+            return np.empty(0, dtype=np.int64)
+        if n > top_n:
+            kth = np.partition(scores, n - top_n)[n - top_n]
+            candidates = np.flatnonzero(scores >= kth)
+        else:
+            candidates = np.arange(n)
+        order = np.argsort(-scores[candidates], kind='stable')
+        return candidates[order[:top_n]]
+    
+    def _calculate_optimization_stats(self, values: np.ndarray) -> Dict:
         """
         Calculate statistics about optimization results
         
         Args:
-            results: List of backtest results
-            optimization_metric: Metric being optimized
+            values: Optimization metric of each tested strategy
             
         Returns:
             Statistics dictionary
         """
-        if not results:
+        if values.size == 0:
             return {}
         
-        metric_values = [r['metrics'].get(optimization_metric, 0) for r in results]
+        n = values.size
+        mean = values.sum() / n
+        std = np.sqrt(((values - mean) ** 2).sum() / n)
+        
+        # A single selection pass places the minimum, the median pair and
+        # the maximum instead of a full sort plus separate reductions
+        mid = n // 2
+        selected = np.partition(values, sorted({0, max(mid - 1, 0), mid, n - 1}))
+        median = selected[mid] if n % 2 else (selected[mid - 1] + selected[mid]) / 2
+        if np.isnan(mean):
+            # NaN propagates through min/max/median as with np.min/max/median;
+            # np.partition sorts NaN last, so the selection would not
+            min_value = max_value = median = np.nan
+        else:
+            min_value, max_value = selected[0], selected[n - 1]
         
         return {
-            'mean': float(np.mean(metric_values)),
-            'median': float(np.median(metric_values)),
-            'std': float(np.std(metric_values)),
-            'min': float(np.min(metric_values)),
-            'max': float(np.max(metric_values)),
-            'improvement': float(np.max(metric_values) - np.mean(metric_values))
+            'mean': float(mean),
+            'median': float(median),
+            'std': float(std),
+            'min': float(min_value),
+            'max': float(max_value),
+            'improvement': float(max_value - mean)
         }
     
     def _optimize_without_params(
@@ -332,6 +890,8 @@ class StrategyOptimizer:
             'base_strategy': strategy_config.get('name', 'Custom Strategy'),
             'optimization_metric': 'sharpe_ratio',
             'total_tested': 1,
+            'eliminated': 0,
+            'abandoned': 0,
             'top_strategies': [{
                 'parameters': {},
                 'metrics': result['metrics'],
@@ -408,6 +968,7 @@ class StrategyOptimizer:
             # Fetch market data
             data_fetcher = MarketDataFetcher()
             market_data = data_fetcher.fetch_data(symbol, period=period)
+            prepared_market = _PreparedMarket.from_frame(market_data)
             
             base_config = {
                 'name': strategy.name,
@@ -421,6 +982,7 @@ class StrategyOptimizer:
                 base_config['optimizable_params'] = prebuilt['optimizable_params']
             
             generations = []
+            new_strategies = []
             current_config = base_config
             
             for gen in range(1, max_generations + 1):
@@ -432,7 +994,8 @@ class StrategyOptimizer:
                     market_data,
                     optimization_metric='sharpe_ratio',
                     max_iterations=30,
-                    top_n=3
+                    top_n=3,
+                    prepared_market=prepared_market
                 )
                 
                 if not optimization_result['success'] or not optimization_result['top_strategies']:
@@ -450,21 +1013,20 @@ class StrategyOptimizer:
                     generation=gen
                 )
                 
-                # Save to database
+                # Queue for the database; all generations are inserted together
                 new_strategy = Strategy(
                     name=evolved_strategy['name'],
                     description=evolved_strategy['description'],
-                    config=json.dumps(evolved_strategy['config']),
+                    config=_json_bytes(evolved_strategy['config']).decode(),
                     tags=','.join(evolved_strategy['tags']),
                     risk_level=evolved_strategy['risk_level'],
                     is_active=True
                 )
-                db_session.add(new_strategy)
-                db_session.flush()
+                new_strategies.append(new_strategy)
                 
                 generations.append({
                     'generation': gen,
-                    'strategy_id': new_strategy.id,
+                    'strategy_id': None,
                     'strategy_name': evolved_strategy['name'],
                     'metrics': best_result['metrics'],
                     'parameters': best_result['parameters']
@@ -480,6 +1042,12 @@ class StrategyOptimizer:
                 logger.info(f"Generation {gen} complete - "
                            f"Sharpe: {best_result['metrics']['sharpe_ratio']:.2f}")
             
+            # One flush assigns every new strategy its id
+            db_session.add_all(new_strategies)
+            db_session.flush()
+            for record, new_strategy in zip(generations, new_strategies):
+                record['strategy_id'] = new_strategy.id
+            
             db_session.commit()
             
             return {
@@ -3,12 +3,25 @@
 Pre-built Trading Strategies
 Collection of proven trading strategies that users can use immediately
 """
-from typing import Dict, List
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Tuple
+from functools import lru_cache, wraps
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _constant(factory: Callable[[], Dict]) -> Callable[[], Mapping]:
+    """Build a strategy once; every call returns the same read-only mapping"""
+    @wraps(factory)
+    @lru_cache(maxsize=1)
+    def wrapper() -> Mapping:
+        return MappingProxyType(factory())
+    
+    return wrapper
+
+
 class PrebuiltStrategies:
     """
     Collection of pre-configured trading strategies
@@ -20,17 +33,13 @@ class PrebuiltStrategies:
         """
         Get all pre-built strategies
         
+        The configurations are built once and shared between callers, so
+        treat them as read-only.
+        
         Returns:
             List of strategy configurations
         """
-        return [
-            PrebuiltStrategies.sma_crossover(),
-            PrebuiltStrategies.rsi_oversold_overbought(),
-            PrebuiltStrategies.macd_momentum(),
-            PrebuiltStrategies.bollinger_bands_mean_reversion(),
-            PrebuiltStrategies.triple_ema_trend(),
-            PrebuiltStrategies.rsi_bollinger_combo()
-        ]
+        return list(_all_strategies())
     
     @staticmethod
     def get_by_name(name: str) -> Dict:
@@ -41,15 +50,12 @@ class PrebuiltStrategies:
             name: Strategy name
             
         Returns:
-            Strategy configuration or None
+            Strategy configuration (shared, read-only) or None
         """
-        strategies = PrebuiltStrategies.get_all_strategies()
-        for strategy in strategies:
-            if strategy['name'].lower() == name.lower():
-                return strategy
-        return None
+        return _strategies_by_name().get(name.lower())
     
     @staticmethod
+    @_constant
     def sma_crossover() -> Dict:
         """
         Simple Moving Average Crossover Strategy
@@ -75,11 +81,11 @@ class PrebuiltStrategies:
                     {'type': 'SMA', 'period': 50, 'column': 'Close'}
                 ],
                 'entry_rules': {
-                    'condition': '(SMA_20 > SMA_50) & (SMA_20.shift(1) <= SMA_50.shift(1))',
+                    'condition': 'cross_over(SMA_20, SMA_50)',
                     'description': 'Fast SMA crosses above slow SMA'
                 },
                 'exit_rules': {
-                    'condition': '(SMA_20 < SMA_50) & (SMA_20.shift(1) >= SMA_50.shift(1))',
+                    'condition': 'cross_under(SMA_20, SMA_50)',
                     'description': 'Fast SMA crosses below slow SMA'
                 }
             },
@@ -92,6 +98,7 @@ class PrebuiltStrategies:
         }
     
     @staticmethod
+    @_constant
     def rsi_oversold_overbought() -> Dict:
         """
         RSI Oversold/Overbought Strategy
@@ -116,7 +123,7 @@ class PrebuiltStrategies:
                     {'type': 'RSI', 'period': 14, 'column': 'Close'}
                 ],
                 'entry_rules': {
-                    'condition': '(RSI_14 > 30) & (RSI_14.shift(1) <= 30)',
+                    'condition': 'cross_over(RSI_14, 30)',
                     'description': 'RSI crosses above 30 (oversold recovery)'
                 },
                 'exit_rules': {
@@ -134,6 +141,7 @@ class PrebuiltStrategies:
         }
     
     @staticmethod
+    @_constant
     def macd_momentum() -> Dict:
         """
         MACD Momentum Strategy
@@ -164,11 +172,11 @@ class PrebuiltStrategies:
                     }
                 ],
                 'entry_rules': {
-                    'condition': '(MACD_Line > MACD_Signal) & (MACD_Line.shift(1) <= MACD_Signal.shift(1))',
+                    'condition': 'cross_over(MACD_Line, MACD_Signal)',
                     'description': 'MACD line crosses above signal line'
                 },
                 'exit_rules': {
-                    'condition': '(MACD_Line < MACD_Signal) & (MACD_Line.shift(1) >= MACD_Signal.shift(1))',
+                    'condition': 'cross_under(MACD_Line, MACD_Signal)',
                     'description': 'MACD line crosses below signal line'
                 }
             },
@@ -182,6 +190,7 @@ class PrebuiltStrategies:
         }
     
     @staticmethod
+    @_constant
     def bollinger_bands_mean_reversion() -> Dict:
         """
         Bollinger Bands Mean Reversion Strategy
@@ -223,6 +232,7 @@ class PrebuiltStrategies:
         }
     
     @staticmethod
+    @_constant
     def triple_ema_trend() -> Dict:
         """
         Triple EMA Trend Strategy
@@ -267,6 +277,7 @@ class PrebuiltStrategies:
         }
     
     @staticmethod
+    @_constant
     def rsi_bollinger_combo() -> Dict:
         """
         RSI + Bollinger Bands Combo Strategy
@@ -311,6 +322,39 @@ class PrebuiltStrategies:
         }
 
 
+def _strategy_factories() -> List[Callable[[], Dict]]:
+    """The PrebuiltStrategies methods building each strategy, in listing order"""
+    return [
+        PrebuiltStrategies.sma_crossover,
+        PrebuiltStrategies.rsi_oversold_overbought,
+        PrebuiltStrategies.macd_momentum,
+        PrebuiltStrategies.bollinger_bands_mean_reversion,
+        PrebuiltStrategies.triple_ema_trend,
+        PrebuiltStrategies.rsi_bollinger_combo
+    ]
+
+
+@lru_cache(maxsize=1)
+def _all_strategies() -> Tuple[Dict, ...]:
+    """Every pre-built strategy, built on first use and then reused"""
+    return tuple(factory() for factory in _strategy_factories())
+
+
+@lru_cache(maxsize=1)
+def _strategies_by_name() -> Dict[str, Dict]:
+    """Lower-cased strategy name -> configuration, indexed once"""
+    return {strategy['name'].lower(): strategy for strategy in _all_strategies()}
+
+
+@lru_cache(maxsize=1)
+def _serialized_strategies() -> Dict[str, Tuple[str, str]]:
+    """Strategy name -> (config JSON, comma-separated tags) as stored in the database"""
+    return {
+        strategy['name']: (json.dumps(strategy['config']), ','.join(strategy['tags']))
+        for strategy in _all_strategies()
+    }
+
+
 def initialize_prebuilt_strategies(db_session) -> List:
     """
     Initialize database with pre-built strategies if they don't exist
@@ -322,34 +366,40 @@ def initialize_prebuilt_strategies(db_session) -> List:
         List of created strategy IDs
     """
     from app.models.strategy import Strategy
-    import json
     
     strategies = PrebuiltStrategies.get_all_strategies()
-    created_ids = []
     
+    # One query finds which strategies already exist
+    existing = {
+        name for (name,) in db_session.query(Strategy.name).filter(
+            Strategy.name.in_([strategy_data['name'] for strategy_data in strategies])
+        )
+    }
+    
+    serialized = _serialized_strategies()
+    new_strategies = []
     for strategy_data in strategies:
-        # Check if strategy already exists
-        existing = db_session.query(Strategy).filter(
-            Strategy.name == strategy_data['name']
-        ).first()
-        
-        if not existing:
-            strategy = Strategy(
-                name=strategy_data['name'],
-                description=strategy_data['description'],
-                config=json.dumps(strategy_data['config']),
-                tags=','.join(strategy_data['tags']),
-                risk_level=strategy_data['risk_level'],
-                timeframe=strategy_data.get('timeframe'),
-                version=strategy_data.get('version', '1.0.0'),
-                is_active=True
-            )
-            db_session.add(strategy)
-            db_session.flush()
-            created_ids.append(strategy.id)
-            logger.info(f"Created pre-built strategy: {strategy_data['name']}")
-        else:
+        if strategy_data['name'] in existing:
             logger.info(f"Pre-built strategy already exists: {strategy_data['name']}")
+            continue
+        config_json, tags_csv = serialized[strategy_data['name']]
+        new_strategies.append(Strategy(
+            name=strategy_data['name'],
+            description=strategy_data['description'],
+            config=config_json,
+            tags=tags_csv,
+            risk_level=strategy_data['risk_level'],
+            timeframe=strategy_data.get('timeframe'),
+            version=strategy_data.get('version', '1.0.0'),
+            is_active=True
+        ))
+    
+    # ...and one flush inserts the missing ones and assigns their ids
+    db_session.add_all(new_strategies)
+    db_session.flush()
+    created_ids = [strategy.id for strategy in new_strategies]
+    for strategy in new_strategies:
+        logger.info(f"Created pre-built strategy: {strategy.name}")
     
     db_session.commit()
     return created_ids
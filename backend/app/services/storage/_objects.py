@@ -0,0 +1,149 @@
+from __future__ import annotations
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Generic, Hashable, Tuple, TypeVar
+import io
+import json
+import pickle
+
+import pandas as pd
+import pyarrow as pa
+
+# Extensions probed by get() for non-DataFrame values, in probe order
+OBJECT_EXTS = (".json", ".pkl")
+
+# Traces whose per-trace memos (key prefixes, known extensions) a backend keeps
+TRACE_MEMO_SIZE = 1024
+
+# Data page size of written Parquet files, pinned so encoding does not drift
+# with pyarrow defaults; repetitive indicator columns are dictionary-encoded
+DATA_PAGE_SIZE = 1 << 20
+
+
+_V = TypeVar("_V")
+
+
+class LRUCache(Generic[_V]):
+    """Thread-safe mapping holding at most ``maxsize`` entries; the least
+    recently used entry is evicted first"""
+
+    def __init__(self, maxsize: int):
+        self._data: "OrderedDict[Hashable, _V]" = OrderedDict()
+        self._maxsize = maxsize
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._data.get(key, default)
+            if key in self._data:
+                self._data.move_to_end(key)
+            return value
+
+    def setdefault(self, key: Hashable, default: _V) -> _V:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return self._data[key]
+            self._data[key] = default
+            if len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+            return default
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            return self._data.pop(key, default)
+
+
+def codec_available(codec: str) -> bool:
+    try:
+        return pa.Codec.is_available(codec)
+    except ValueError:  # "none"/"uncompressed" are not arrow codecs
+        return True
+
+
+def supports_level(codec: str | None) -> bool:
+    try:
+        return bool(codec) and pa.Codec.supports_compression_level(codec)
+    except ValueError:
+        return False
+
+
+def parquet_options(codec: str, level: int | None) -> Dict[str, Any]:
+    """to_parquet keyword arguments for writing with ``codec`` at ``level``"""
+    options: Dict[str, Any] = {
+        "compression": codec,
+        "use_dictionary": True,
+        "data_page_size": DATA_PAGE_SIZE,
+    }
+    # Snappy and friends reject a level, so only pass it where it applies
+    if level is not None and supports_level(codec):
+        options["compression_level"] = level
+    return options
+
+
+def probe_exts(ext: str | None, exts: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Extensions get() should try: only ``ext`` when the caller passes back
+    the one put() reported, else every one of ``exts`` in order"""
+    if ext is None:
+        return exts
+    if ext not in exts:
+        raise ValueError(f"Unknown storage extension {ext!r}, expected one of {exts}")
+    return (ext,)
+
+
+def dump_object(value: Any) -> Tuple[bytes, str]:
+    """Serialize a non-DataFrame value, returning its bytes and file extension.
+
+    Values that survive a JSON round trip unchanged (configs, params, reports
+    of plain types) are written as JSON; anything else falls back to pickle.
+    Either way the reader gets back the value itself, not a wrapper.
+    """
+    if not hasattr(value, "to_pickle"):
+        try:
+            text = json.dumps(value, allow_nan=False)
+        except (TypeError, ValueError):
+            text = None
+        # Tuples and non-string dict keys come back changed, keep them pickled
+        if text is not None and json.loads(text) == value:
+            return text.encode(), ".json"
+    if hasattr(value, "to_pickle"):
+        # A Series shaped like the legacy wrapper is wrapped once more, so
+        # read_pickle's unwrapping hands it back intact
+        if _is_legacy_wrapper(value):
+            value = pd.Series([value])
+        buf = io.BytesIO()
+        value.to_pickle(buf)
+        return buf.getvalue(), ".pkl"
+    # A plain pickle; read_pickle loads it as the original object
+    return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), ".pkl"
+
+
+def _is_legacy_wrapper(obj: Any) -> bool:
+    # Older releases pickled every non-pandas value as pd.Series([value])
+    return (
+        isinstance(obj, pd.Series)
+        and obj.name is None
+        and isinstance(obj.index, pd.RangeIndex)
+        and obj.index.equals(pd.RangeIndex(1))
+    )
+
+
+def read_pickle(source: Any) -> Any:
+    """Load a value written by dump_object from a path or binary file object.
+
+    Pickles written as the legacy one-element ``pd.Series([value])`` wrapper
+    are unwrapped, so a key reads back the same type whenever it was written.
+    """
+    obj = pd.read_pickle(source)
+    return obj.iloc[0] if _is_legacy_wrapper(obj) else obj
+
+
+def read_json(source: Any) -> Any:
+    """Load a value written by dump_object from a path or binary file object"""
+    if hasattr(source, "read"):
+        return json.loads(source.read())
+    with open(source, "rb") as f:
+        return json.loads(f.read())
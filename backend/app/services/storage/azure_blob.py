@@ -1,16 +1,37 @@
 from __future__ import annotations
-from typing import Any, Dict, Optional
-from pathlib import Path
-import tempfile
+from typing import Any, Dict, List, Optional
+from functools import partial
+import io
+import logging
 
 import pandas as pd
 
-try:
-    from azure.storage.blob import BlobServiceClient  # type: ignore
-except Exception:  # pragma: no cover
-    BlobServiceClient = None
+# Bound by _load_sdk() when the backend is first created, so importing this
+# module (or running with Azure disabled) never pays for the SDK import
+BlobServiceClient = None
+ResourceNotFoundError = FileNotFoundError  # never raised; the backend requires the SDK
+PartialBatchErrorException = FileNotFoundError  # never raised; the backend requires the SDK
 
 from app.core.config import get_settings
+from app.services.storage._objects import OBJECT_EXTS, TRACE_MEMO_SIZE, LRUCache, dump_object, probe_exts, read_json, read_pickle
+
+logger = logging.getLogger(__name__)
+
+# Blob batch requests accept at most 256 sub-requests
+_DELETE_BATCH = 256
+
+
+def _load_sdk() -> bool:
+    global BlobServiceClient, ResourceNotFoundError, PartialBatchErrorException
+    if BlobServiceClient is None:
+        try:
+            from azure.core.exceptions import ResourceNotFoundError as not_found  # type: ignore
+            from azure.storage.blob import BlobServiceClient as client  # type: ignore
+            from azure.storage.blob import PartialBatchErrorException as partial_batch  # type: ignore
+        except Exception:  # pragma: no cover
+            return False
+        BlobServiceClient, ResourceNotFoundError, PartialBatchErrorException = client, not_found, partial_batch
+    return True
 
 
 class AzureBlobBackend:
@@ -20,7 +41,7 @@ class AzureBlobBackend:
         self.settings = get_settings()
         if not self.settings.AZURE_ENABLED:
             raise RuntimeError("Azure backend is not enabled in settings")
-        if BlobServiceClient is None:
+        if not _load_sdk():
             raise RuntimeError("azure-storage-blob is required for Azure backend")
         if self.settings.AZURE_CONNECTION_STRING:
             self.client = BlobServiceClient.from_connection_string(self.settings.AZURE_CONNECTION_STRING)
@@ -28,75 +49,75 @@ class AzureBlobBackend:
             self.client = BlobServiceClient(account_url=None)  # Will fail without MSI/environment; placeholder
         self.container = self.client.get_container_client(self.settings.AZURE_CONTAINER)
         self.prefix = self.settings.AZURE_PREFIX.strip("/")
+        # Resolved once; _key runs for every object put, get and delete
+        self._key_prefix = self.prefix + "/"
+        # "<prefix>/<trace_id>/" for recently used traces, dropped by clear()
+        self._trace_prefixes: LRUCache[str] = LRUCache(TRACE_MEMO_SIZE)
+
+    def _trace_prefix(self, trace_id: str) -> str:
+        tp = self._trace_prefixes.get(trace_id)
+        if tp is None:
+            tp = self._trace_prefixes.setdefault(trace_id, self._key_prefix + trace_id + "/")
+        return tp
 
     def _key(self, trace_id: str, key: str, ext: str) -> str:
-        return f"{self.prefix}/{trace_id}/{key}{ext}"
+        return self._trace_prefix(trace_id) + key + ext
 
     def put(self, trace_id: str, key: str, value: Any, meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        # Serialize in memory and upload the bytes directly, no temp files
         if isinstance(value, pd.DataFrame):
-            with tempfile.TemporaryDirectory() as td:
-                fpath = Path(td) / f"{key}.parquet"
-                value.to_parquet(fpath, compression="snappy", index=False)
-                blob_name = self._key(trace_id, key, ".parquet")
-                with open(fpath, "rb") as fh:
-                    self.container.upload_blob(name=blob_name, data=fh, overwrite=True)
-                try:
-                    from app.services.costs import add_io
-                    add_io(trace_id, bytes_written=fpath.stat().st_size, objects_written=1)
-                except Exception:
-                    pass
-                return {"backend": self.name, "dtype": "DataFrame", "key": blob_name}
+            buf = io.BytesIO()
+            value.to_parquet(buf, compression="snappy", index=False)
+            data, ext, dtype = buf.getvalue(), ".parquet", "DataFrame"
         else:
-            with tempfile.TemporaryDirectory() as td:
-                fpath = Path(td) / f"{key}.pkl"
-                value.to_pickle(fpath) if hasattr(value, "to_pickle") else pd.Series([value]).to_pickle(fpath)
-                blob_name = self._key(trace_id, key, ".pkl")
-                with open(fpath, "rb") as fh:
-                    self.container.upload_blob(name=blob_name, data=fh, overwrite=True)
-                try:
-                    from app.services.costs import add_io
-                    add_io(trace_id, bytes_written=fpath.stat().st_size, objects_written=1)
-                except Exception:
-                    pass
-                return {"backend": self.name, "dtype": type(value).__name__, "key": blob_name}
-
-    def get(self, trace_id: str, key: str) -> Any:
-        for ext, reader in ((".parquet", pd.read_parquet), (".pkl", pd.read_pickle)):
-            blob_name = self._key(trace_id, key, ext)
-            blob = self.container.get_blob_client(blob_name)
+            data, ext = dump_object(value)
+            dtype = type(value).__name__
+        blob_name = self._key(trace_id, key, ext)
+        self.container.upload_blob(name=blob_name, data=data, overwrite=True)
+        try:
+            from app.services.costs import add_io
+            add_io(trace_id, bytes_written=len(data), objects_written=1)
+        except Exception:
+            pass
+        return {"backend": self.name, "dtype": dtype, "ext": ext, "key": blob_name}
+
+    def get(self, trace_id: str, key: str, *, columns: List[str] | None = None, ext: str | None = None) -> Any:
+        readers = {".parquet": partial(pd.read_parquet, columns=columns), ".json": read_json, ".pkl": read_pickle}
+        for ext in probe_exts(ext, tuple(readers)):
+            reader = readers[ext]
+            blob = self.container.get_blob_client(self._key(trace_id, key, ext))
+            # Only a missing blob moves on to the next format; auth, network
+            # and decoding errors propagate
             try:
-                with tempfile.TemporaryDirectory() as td:
-                    fpath = Path(td) / f"{key}{ext}"
-                    with open(fpath, "wb") as fh:
-                        stream = blob.download_blob()
-                        fh.write(stream.readall())
-                    try:
-                        from app.services.costs import add_io
-                        add_io(trace_id, bytes_read=Path(fpath).stat().st_size, objects_read=1)
-                    except Exception:
-                        pass
-                    return reader(fpath)
-            except Exception:
+                data = blob.download_blob().readall()
+            except ResourceNotFoundError:
                 continue
+            try:
+                from app.services.costs import add_io
+                add_io(trace_id, bytes_read=len(data), objects_read=1)
+            except Exception:
+                pass
+            return reader(io.BytesIO(data))
         return None
 
     def delete(self, trace_id: str, key: str) -> None:
-        for ext in (".parquet", ".pkl"):
+        for ext in (".parquet",) + OBJECT_EXTS:
             blob_name = self._key(trace_id, key, ext)
             try:
                 self.container.delete_blob(blob_name)
-            except Exception:
+            except ResourceNotFoundError:
                 pass
 
     def clear(self, trace_id: str) -> None:
-        prefix = f"{self.prefix}/{trace_id}/"
-        try:
-            blobs = self.container.list_blobs(name_starts_with=prefix)
-            for b in blobs:
-                try:
-                    self.container.delete_blob(b.name)
-                except Exception:
-                    pass
-        except Exception:
-            pass
-
+        prefix = self._trace_prefixes.pop(trace_id, None) or self._key_prefix + trace_id + "/"
+        names = [b.name for b in self.container.list_blobs(name_starts_with=prefix)]
+        # Batch requests delete up to _DELETE_BATCH blobs per round trip; blobs
+        # already gone are fine, any other failed sub-request is raised
+        for start in range(0, len(names), _DELETE_BATCH):
+            batch = names[start:start + _DELETE_BATCH]
+            try:
+                self.container.delete_blobs(*batch)
+            except PartialBatchErrorException as e:
+                if any(part.status_code not in (202, 404) for part in e.parts):
+                    logger.warning(f"Failed to delete some of {len(batch)} blobs under {prefix}: {e}")
+                    raise
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Protocol, Any, Dict, Optional
+from typing import Protocol, Any, Dict, List, Optional
 
 
 class BaseStorageBackend(Protocol):
@@ -8,7 +8,7 @@ class BaseStorageBackend(Protocol):
     def put(self, trace_id: str, key: str, value: Any, meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         ...
 
-    def get(self, trace_id: str, key: str) -> Any:
+    def get(self, trace_id: str, key: str, *, columns: Optional[List[str]] = None, ext: Optional[str] = None) -> Any:
         ...
 
     def delete(self, trace_id: str, key: str) -> None:
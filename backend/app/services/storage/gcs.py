@@ -1,16 +1,36 @@
 from __future__ import annotations
-from typing import Any, Dict, Optional
-from pathlib import Path
-import tempfile
+from typing import Any, Dict, List, Optional
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import io
+import logging
 
 import pandas as pd
 
-try:
-    from google.cloud import storage  # type: ignore
-except Exception:  # pragma: no cover
-    storage = None
+# Bound by _load_sdk() when the backend is first created, so importing this
+# module (or running with GCS disabled) never pays for the SDK import
+storage = None
+NotFound = FileNotFoundError  # never raised; the backend requires the SDK
 
 from app.core.config import get_settings
+from app.services.storage._objects import OBJECT_EXTS, TRACE_MEMO_SIZE, LRUCache, dump_object, probe_exts, read_json, read_pickle
+
+logger = logging.getLogger(__name__)
+
+# Concurrent delete requests issued by clear()
+_DELETE_WORKERS = 32
+
+
+def _load_sdk() -> bool:
+    global storage, NotFound
+    if storage is None:
+        try:
+            from google.api_core.exceptions import NotFound as not_found  # type: ignore
+            from google.cloud import storage as sdk  # type: ignore
+        except Exception:  # pragma: no cover
+            return False
+        storage, NotFound = sdk, not_found
+    return True
 
 
 class GCSBackend:
@@ -20,72 +40,88 @@ class GCSBackend:
         self.settings = get_settings()
         if not self.settings.GCS_ENABLED:
             raise RuntimeError("GCS backend is not enabled in settings")
-        if storage is None:
+        if not _load_sdk():
             raise RuntimeError("google-cloud-storage is required for GCS backend")
         self.client = storage.Client()
         self.bucket = self.client.bucket(self.settings.GCS_BUCKET)
         self.prefix = self.settings.GCS_PREFIX.strip("/")
+        # Resolved once; _key runs for every object put, get and delete
+        self._key_prefix = self.prefix + "/"
+        # "<prefix>/<trace_id>/" for recently used traces, dropped by clear()
+        self._trace_prefixes: LRUCache[str] = LRUCache(TRACE_MEMO_SIZE)
+
+    def _trace_prefix(self, trace_id: str) -> str:
+        tp = self._trace_prefixes.get(trace_id)
+        if tp is None:
+            tp = self._trace_prefixes.setdefault(trace_id, self._key_prefix + trace_id + "/")
+        return tp
 
     def _key(self, trace_id: str, key: str, ext: str) -> str:
-        return f"{self.prefix}/{trace_id}/{key}{ext}"
+        return self._trace_prefix(trace_id) + key + ext
 
     def put(self, trace_id: str, key: str, value: Any, meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        # Serialize in memory and upload the bytes directly, no temp files
         if isinstance(value, pd.DataFrame):
-            with tempfile.TemporaryDirectory() as td:
-                fpath = Path(td) / f"{key}.parquet"
-                value.to_parquet(fpath, compression="snappy", index=False)
-                blob = self.bucket.blob(self._key(trace_id, key, ".parquet"))
-                blob.upload_from_filename(str(fpath))
-                try:
-                    from app.services.costs import add_io
-                    add_io(trace_id, bytes_written=fpath.stat().st_size, objects_written=1)
-                except Exception:
-                    pass
-                return {"backend": self.name, "dtype": "DataFrame", "key": blob.name}
+            buf = io.BytesIO()
+            value.to_parquet(buf, compression="snappy", index=False)
+            data, ext, dtype = buf.getvalue(), ".parquet", "DataFrame"
         else:
-            with tempfile.TemporaryDirectory() as td:
-                fpath = Path(td) / f"{key}.pkl"
-                value.to_pickle(fpath) if hasattr(value, "to_pickle") else pd.Series([value]).to_pickle(fpath)
-                blob = self.bucket.blob(self._key(trace_id, key, ".pkl"))
-                blob.upload_from_filename(str(fpath))
-                try:
-                    from app.services.costs import add_io
-                    add_io(trace_id, bytes_written=fpath.stat().st_size, objects_written=1)
-                except Exception:
-                    pass
-                return {"backend": self.name, "dtype": type(value).__name__, "key": blob.name}
+            data, ext = dump_object(value)
+            dtype = type(value).__name__
+        blob = self.bucket.blob(self._key(trace_id, key, ext))
+        blob.upload_from_string(data, content_type="application/octet-stream")
+        try:
+            from app.services.costs import add_io
+            add_io(trace_id, bytes_written=len(data), objects_written=1)
+        except Exception:
+            pass
+        return {"backend": self.name, "dtype": dtype, "ext": ext, "key": blob.name}
 
-    def get(self, trace_id: str, key: str) -> Any:
-        for ext, reader in ((".parquet", pd.read_parquet), (".pkl", pd.read_pickle)):
+    def get(self, trace_id: str, key: str, *, columns: List[str] | None = None, ext: str | None = None) -> Any:
+        readers = {".parquet": partial(pd.read_parquet, columns=columns), ".json": read_json, ".pkl": read_pickle}
+        for ext in probe_exts(ext, tuple(readers)):
+            reader = readers[ext]
             blob = self.bucket.blob(self._key(trace_id, key, ext))
-            if blob.exists():
-                with tempfile.TemporaryDirectory() as td:
-                    fpath = Path(td) / f"{key}{ext}"
-                    blob.download_to_filename(str(fpath))
-                    try:
-                        from app.services.costs import add_io
-                        add_io(trace_id, bytes_read=Path(fpath).stat().st_size, objects_read=1)
-                    except Exception:
-                        pass
-                    return reader(fpath)
+            # One GET per probe instead of an exists() HEAD first; only a
+            # missing object moves on to the next format
+            try:
+                data = blob.download_as_bytes()
+            except NotFound:
+                continue
+            try:
+                from app.services.costs import add_io
+                add_io(trace_id, bytes_read=len(data), objects_read=1)
+            except Exception:
+                pass
+            return reader(io.BytesIO(data))
         return None
 
     def delete(self, trace_id: str, key: str) -> None:
-        for ext in (".parquet", ".pkl"):
+        for ext in (".parquet",) + OBJECT_EXTS:
             blob = self.bucket.blob(self._key(trace_id, key, ext))
             try:
                 blob.delete()
-            except Exception:
+            except NotFound:
                 pass
 
     def clear(self, trace_id: str) -> None:
-        prefix = f"{self.prefix}/{trace_id}/"
-        try:
-            for blob in self.client.list_blobs(self.settings.GCS_BUCKET, prefix=prefix):
+        prefix = self._trace_prefixes.pop(trace_id, None) or self._key_prefix + trace_id + "/"
+        blobs = list(self.client.list_blobs(self.settings.GCS_BUCKET, prefix=prefix))
+        if not blobs:
+            return
+        # Deletes are independent HTTP calls, so overlap them on threads. A
+        # blob already gone is fine; other failures are raised once the rest
+        # of the deletes have finished.
+        error: Exception | None = None
+        with ThreadPoolExecutor(max_workers=min(_DELETE_WORKERS, len(blobs))) as pool:
+            futures = {pool.submit(blob.delete): blob for blob in blobs}
+            for future in as_completed(futures):
                 try:
-                    blob.delete()
-                except Exception:
+                    future.result()
+                except NotFound:
                     pass
-        except Exception:
-            pass
-
+                except Exception as e:
+                    logger.warning(f"Failed to delete {futures[future].name}: {e}")
+                    error = error or e
+        if error is not None:
+            raise error
@@ -1,21 +1,35 @@
 from __future__ import annotations
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import os
+from bisect import bisect_right
+from collections import OrderedDict
 from pathlib import Path
+from threading import Lock
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq_mod
 
 
 from app.core.config import get_settings
+from app.services.storage._objects import OBJECT_EXTS, dump_object, parquet_options, probe_exts, read_json, read_pickle
 
 
 class LocalParquetBackend:
     name = "local"
 
-    def __init__(self, base_path: str | None = None, codec: str | None = None):
+    def __init__(self, base_path: str | None = None, codec: str | None = None, codec_level: int | None = None):
         settings = get_settings()
         self.base_path = Path(base_path or settings.LOCAL_STORAGE_BASE)
         self.codec = (codec or settings.LOCAL_STORAGE_CODEC)
+        self.codec_level = codec_level if codec_level is not None else settings.LOCAL_STORAGE_CODEC_LEVEL
+        self._write_options = parquet_options(self.codec, self.codec_level)
+        # Decoded frames by (trace, key, mtime_ns, size), least recent first;
+        # a rewritten file has a new stat and so never hits a stale entry
+        self._cache: "OrderedDict[Tuple[str, str, int, int], Tuple[pd.DataFrame, int]]" = OrderedDict()
+        self._cache_bytes = 0
+        self._cache_budget = settings.LOCAL_STORAGE_CACHE_BYTES
+        self._cache_lock = Lock()
         self.base_path.mkdir(parents=True, exist_ok=True)
 
     def _trace_dir(self, trace_id: str) -> Path:
@@ -23,87 +37,164 @@ class LocalParquetBackend:
         p.mkdir(parents=True, exist_ok=True)
         return p
 
+    def _cache_get(self, ck: Tuple[str, str, int, int]) -> pd.DataFrame | None:
+        with self._cache_lock:
+            hit = self._cache.get(ck)
+            if hit is None:
+                return None
+            self._cache.move_to_end(ck)
+            return hit[0]
+
+    def _cache_put(self, ck: Tuple[str, str, int, int], df: pd.DataFrame) -> None:
+        size = int(df.memory_usage(deep=False).sum())
+        if size > self._cache_budget:
+            return
+        with self._cache_lock:
+            self._cache_drop_locked(ck[0], ck[1])
+            self._cache[ck] = (df, size)
+            self._cache_bytes += size
+            while self._cache_bytes > self._cache_budget:
+                _, (_, evicted) = self._cache.popitem(last=False)
+                self._cache_bytes -= evicted
+
+    def _cache_drop_locked(self, trace_id: str, key: str | None = None) -> None:
+        for ck in [ck for ck in self._cache if ck[0] == trace_id and (key is None or ck[1] == key)]:
+            self._cache_bytes -= self._cache.pop(ck)[1]
+
+    def _cache_drop(self, trace_id: str, key: str | None = None) -> None:
+        with self._cache_lock:
+            self._cache_drop_locked(trace_id, key)
+
+    def _drop_other_formats(self, tdir: Path, key: str, ext: str) -> None:
+        # get() probes formats in order, so a key rewritten as another type
+        # must not leave its previous file behind to shadow the new one
+        for suffix in (".parquet",) + OBJECT_EXTS:
+            if suffix != ext:
+                try:
+                    os.unlink(tdir / f"{key}{suffix}")
+                except FileNotFoundError:
+                    pass
+
     def put(self, trace_id: str, key: str, value: Any, meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        self._cache_drop(trace_id, key)
         tdir = self._trace_dir(trace_id)
         if isinstance(value, pd.DataFrame):
             fpath = tdir / f"{key}.parquet"
-            value.to_parquet(fpath, compression=self.codec, index=False)
+            value.to_parquet(fpath, engine="pyarrow", index=False, **self._write_options)
+            self._drop_other_formats(tdir, key, ".parquet")
             try:
                 from app.services.costs import add_io
                 add_io(trace_id, bytes_written=fpath.stat().st_size, objects_written=1)
             except Exception:
                 pass
-            return {"backend": self.name, "dtype": "DataFrame", "path": str(fpath)}
+            return {"backend": self.name, "dtype": "DataFrame", "ext": ".parquet", "path": str(fpath)}
         else:
-            # Fallback to pickle for arbitrary objects
-            fpath = tdir / f"{key}.pkl"
-            value.to_pickle(fpath) if hasattr(value, "to_pickle") else pd.Series([value]).to_pickle(fpath)
+            # JSON for plain values, pickle for arbitrary objects
+            data, ext = dump_object(value)
+            fpath = tdir / f"{key}{ext}"
+            fpath.write_bytes(data)
+            self._drop_other_formats(tdir, key, ext)
             try:
                 from app.services.costs import add_io
-                add_io(trace_id, bytes_written=fpath.stat().st_size, objects_written=1)
+                add_io(trace_id, bytes_written=len(data), objects_written=1)
             except Exception:
                 pass
-            return {"backend": self.name, "dtype": type(value).__name__, "path": str(fpath)}
+            return {"backend": self.name, "dtype": type(value).__name__, "ext": ext, "path": str(fpath)}
+
+    def get_arrow(self, trace_id: str, key: str, *, columns: List[str] | None = None) -> pa.Table | None:
+        """Stored DataFrame as a memory-mapped Arrow table, for callers that skip pandas.
+        Only ``columns`` are decoded when given."""
+        pq = self._trace_dir(trace_id) / f"{key}.parquet"
+        if not pq.exists():
+            return None
+        table = pq_mod.read_table(pq, columns=columns, memory_map=True)
+        try:
+            from app.services.costs import add_io
+            add_io(trace_id, bytes_read=pq.stat().st_size, objects_read=1)
+        except Exception:
+            pass
+        return table
 
-    def get(self, trace_id: str, key: str) -> Any:
+    def get(self, trace_id: str, key: str, *, columns: List[str] | None = None, ext: str | None = None) -> Any:
+        # DataFrames come from the LRU cache while their file is unchanged.
+        # Callers get a shallow copy: adding or replacing columns is safe,
+        # modifying values in place is not. A column subset is served from a
+        # cached whole frame when there is one, else read alone (not cached).
+        # With ``ext`` from put() only that one file is looked at.
+        exts = probe_exts(ext, (".parquet",) + OBJECT_EXTS)
         tdir = self._trace_dir(trace_id)
         pq = tdir / f"{key}.parquet"
-        if pq.exists():
-            df = pd.read_parquet(pq)
-            try:
-                from app.services.costs import add_io
-                add_io(trace_id, bytes_read=pq.stat().st_size, objects_read=1)
-            except Exception:
-                pass
-            return df
-        pkl = tdir / f"{key}.pkl"
-        if pkl.exists():
-            obj = pd.read_pickle(pkl)
-            try:
-                from app.services.costs import add_io
-                add_io(trace_id, bytes_read=pkl.stat().st_size, objects_read=1)
-            except Exception:
-                pass
-            return obj
+        try:
+            st = pq.stat() if ".parquet" in exts else None
+        except FileNotFoundError:
+            st = None
+        if st is not None:
+            ck = (trace_id, key, st.st_mtime_ns, st.st_size)
+            df = self._cache_get(ck) if self._cache_budget > 0 else None
+            if df is not None and columns is not None:
+                return df[list(columns)]
+            if df is None:
+                table = self.get_arrow(trace_id, key, columns=columns)
+                if table is not None:
+                    # Arrow buffers are released column by column as they convert
+                    df = table.to_pandas(self_destruct=True, split_blocks=True)
+                    if self._cache_budget > 0 and columns is None:
+                        self._cache_put(ck, df)
+            if df is not None:
+                return df.copy(deep=False)
+        for ext, reader in ((".json", read_json), (".pkl", read_pickle)):
+            fp = tdir / f"{key}{ext}"
+            if ext in exts and fp.exists():
+                obj = reader(fp)
+                try:
+                    from app.services.costs import add_io
+                    add_io(trace_id, bytes_read=fp.stat().st_size, objects_read=1)
+                except Exception:
+                    pass
+                return obj
         return None
 
     def delete(self, trace_id: str, key: str) -> None:
+        self._cache_drop(trace_id, key)
         tdir = self._trace_dir(trace_id)
-        for suffix in (".parquet", ".pkl"):
+        for suffix in (".parquet",) + OBJECT_EXTS:
             fp = tdir / f"{key}{suffix}"
             if fp.exists():
                 fp.unlink()
 
     def clear(self, trace_id: str) -> None:
+        self._cache_drop(trace_id)
         tdir = self._trace_dir(trace_id)
         if tdir.exists():
-            for f in tdir.iterdir():
-                try:
-                    f.unlink()
-                except Exception:
-                    pass
+            with os.scandir(tdir) as it:
+                for e in it:
+                    try:
+                        os.unlink(e.path)
+                    except FileNotFoundError:
+                        pass
             try:
                 tdir.rmdir()
-            except Exception:
+            except OSError:  # a concurrent put() added a file meanwhile
                 pass
 
     def list(self, trace_id: str, limit: int = 100, cursor: str | None = None) -> Dict[str, Any]:
         tdir = self._trace_dir(trace_id)
         items = []
-        entries = sorted([p for p in tdir.iterdir() if p.is_file()], key=lambda p: p.name)
+        # DirEntry carries the type from the directory read, so only the
+        # returned page is stat'ed
+        with os.scandir(tdir) as it:
+            entries = sorted((e for e in it if e.is_file(follow_symlinks=False)), key=lambda e: e.name)
         start = 0
         if cursor:
-            try:
-                start = next(i for i, p in enumerate(entries) if p.name > cursor)
-            except StopIteration:
-                start = len(entries)
-        for p in entries[start:start+limit]:
+            start = bisect_right([e.name for e in entries], cursor)
+        for e in entries[start:start+limit]:
+            st = e.stat()
             items.append({
-                "key": p.stem,
-                "name": p.name,
-                "size": p.stat().st_size,
+                "key": os.path.splitext(e.name)[0],
+                "name": e.name,
+                "size": st.st_size,
                 "backend": self.name,
-                "modified_at": p.stat().st_mtime,
+                "modified_at": st.st_mtime,
             })
         next_cursor = items[-1]["name"] if items and (start + limit) < len(entries) else None
         return {"items": items, "next_cursor": next_cursor}
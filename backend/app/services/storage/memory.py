@@ -1,8 +1,23 @@
 from __future__ import annotations
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
+
+
+def _nbytes(value: Any) -> int:
+    import pandas as pd  # local import
+    if isinstance(value, pd.DataFrame):
+        # deep=False: per-column buffer sizes instead of sizing every object
+        # cell; string payloads are under-counted, fine for cost tracking
+        return int(value.memory_usage(deep=False).sum())
+    return 0
 
 
 class MemoryBackend:
+    """Keeps values by reference; DataFrames come back as independent frames.
+
+    With pandas Copy-on-Write on (the app enables it at start-up) get() hands
+    out an O(1) shallow copy that callers may freely modify without touching
+    the stored frame; without it, a deep copy.
+    """
     name = "memory"
 
     def __init__(self):
@@ -13,23 +28,25 @@ class MemoryBackend:
         bucket[key] = value
         # Update cost tracker
         try:
-            import pandas as pd  # local import
             from app.services.costs import add_io
-            size = value.memory_usage(deep=True).sum() if isinstance(value, pd.DataFrame) else 0
-            add_io(trace_id, bytes_written=size, objects_written=1)
+            add_io(trace_id, bytes_written=_nbytes(value), objects_written=1)
         except Exception:
             pass
         return {"backend": self.name, "dtype": type(value).__name__}
 
-    def get(self, trace_id: str, key: str) -> Any:
+    def get(self, trace_id: str, key: str, *, columns: List[str] | None = None, ext: str | None = None) -> Any:
         val = self._store.get(trace_id, {}).get(key)
         try:
-            import pandas as pd  # local import
             from app.services.costs import add_io
-            size = val.memory_usage(deep=True).sum() if isinstance(val, pd.DataFrame) else 0
-            add_io(trace_id, bytes_read=size, objects_read=1)
+            add_io(trace_id, bytes_read=_nbytes(val), objects_read=1)
         except Exception:
             pass
+        import pandas as pd  # local import
+        if isinstance(val, pd.DataFrame):
+            # Under CoW a new frame sharing the stored buffers until either
+            # side writes; otherwise sharing them would expose in-place edits
+            cow = pd.get_option("mode.copy_on_write")
+            return val.copy(deep=not cow) if columns is None else val[list(columns)].copy(deep=not cow)
         return val
 
     def delete(self, trace_id: str, key: str) -> None:
@@ -1,16 +1,86 @@
 from __future__ import annotations
-from typing import Any, Dict, Optional
-from pathlib import Path
-import tempfile
+from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import io
+import logging
+from threading import Lock
 
 import pandas as pd
 
-try:
-    import boto3  # type: ignore
-except Exception:  # pragma: no cover - boto3 may not be installed in all envs
-    boto3 = None
+# Bound by _load_sdk() when the backend is first created, so importing this
+# module (or running with S3 disabled) never pays for the boto3 import
+boto3 = None
+BotoConfig = None
+TransferConfig = None
+ClientError = FileNotFoundError  # never raised; the backend requires the SDK
 
 from app.core.config import get_settings
+from app.services.storage._objects import OBJECT_EXTS, TRACE_MEMO_SIZE, LRUCache, codec_available, dump_object, parquet_options, probe_exts, read_json, read_pickle
+
+logger = logging.getLogger(__name__)
+
+# Concurrent delete_objects batches issued by clear()
+_DELETE_WORKERS = 16
+
+# Multipart transfers: parts of _PART_SIZE above _MULTIPART_THRESHOLD, with
+# up to _TRANSFER_THREADS parts in flight per object
+_MULTIPART_THRESHOLD = 8 * 1024 * 1024
+_PART_SIZE = 16 * 1024 * 1024
+_TRANSFER_THREADS = 16
+
+# HTTP connections kept by the shared client. Above the default of 10 so
+# parallel clears, multipart transfers and concurrent callers reuse pooled
+# connections instead of discarding them and handshaking again
+_POOL_CONNECTIONS = 64
+
+# Rows per Parquet row group; one group for typical OHLCV frames, several
+# independently decodable ones for long histories
+_ROW_GROUP_SIZE = 128_000
+
+_clients: Dict[str, Any] = {}
+_clients_lock = Lock()
+
+# Stored formats in the order get() prefers them
+_EXTS = (".parquet",) + OBJECT_EXTS
+
+
+def _load_sdk() -> bool:
+    global boto3, BotoConfig, TransferConfig, ClientError
+    if boto3 is None:
+        try:
+            import boto3 as sdk  # type: ignore
+            from boto3.s3.transfer import TransferConfig as transfer_config  # type: ignore
+            from botocore.config import Config as config  # type: ignore
+            from botocore.exceptions import ClientError as client_error  # type: ignore
+        except Exception:  # pragma: no cover - boto3 may not be installed in all envs
+            return False
+        boto3, BotoConfig, TransferConfig, ClientError = sdk, config, transfer_config, client_error
+    return True
+
+
+def _client(region: str) -> Any:
+    # One client per region for the whole process, so its connection pool
+    # and credentials are reused by every backend instance; boto3 clients
+    # are thread-safe
+    client = _clients.get(region)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(region)
+            if client is None:
+                client = _clients[region] = boto3.client(
+                    "s3",
+                    region_name=region,
+                    config=BotoConfig(
+                        max_pool_connections=_POOL_CONNECTIONS,
+                        retries={"max_attempts": 5, "mode": "adaptive"},
+                        tcp_keepalive=True,
+                    ),
+                )
+    return client
+
+
+def _is_missing(e: Exception) -> bool:
+    return e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey")
 
 
 class S3Backend:
@@ -20,14 +90,40 @@ class S3Backend:
         self.settings = get_settings()
         if not self.settings.S3_ENABLED:
             raise RuntimeError("S3 backend is not enabled in settings")
-        if boto3 is None:
+        if not _load_sdk():
             raise RuntimeError("boto3 is required for S3 backend")
-        self.s3 = boto3.client("s3", region_name=self.settings.S3_REGION)
+        self.s3 = _client(self.settings.S3_REGION)
         self.bucket = self.settings.S3_BUCKET
         self.prefix = self.settings.S3_PREFIX.strip("/")
+        # Resolved once; _key runs for every object put, get and delete
+        self._key_prefix = self.prefix + "/"
+        # "<prefix>/<trace_id>/" for recently used traces, dropped by clear()
+        self._trace_prefixes: LRUCache[str] = LRUCache(TRACE_MEMO_SIZE)
+        # Extension each key was last written or found with, for recently
+        # used traces; dropped by clear()
+        self._exts: LRUCache[Dict[str, str]] = LRUCache(TRACE_MEMO_SIZE)
+        self._upload_args = self._extra_args()
+        # Objects are transfer-bound, so trade a little CPU for smaller files
+        codec = self.settings.S3_PARQUET_CODEC
+        self._write_options = {
+            **parquet_options(codec if codec_available(codec) else "snappy", self.settings.S3_PARQUET_CODEC_LEVEL),
+            "row_group_size": _ROW_GROUP_SIZE,
+        }
+        self._transfer = TransferConfig(
+            multipart_threshold=_MULTIPART_THRESHOLD,
+            multipart_chunksize=_PART_SIZE,
+            max_concurrency=_TRANSFER_THREADS,
+            use_threads=True,
+        )
+
+    def _trace_prefix(self, trace_id: str) -> str:
+        tp = self._trace_prefixes.get(trace_id)
+        if tp is None:
+            tp = self._trace_prefixes.setdefault(trace_id, self._key_prefix + trace_id + "/")
+        return tp
 
     def _key(self, trace_id: str, key: str, ext: str) -> str:
-        return f"{self.prefix}/{trace_id}/{key}{ext}"
+        return self._trace_prefix(trace_id) + key + ext
 
     def _extra_args(self) -> Dict[str, Any]:
         extra: Dict[str, Any] = {}
@@ -38,64 +134,106 @@ class S3Backend:
         return extra
 
     def put(self, trace_id: str, key: str, value: Any, meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        # Serialize in memory and stream the buffer up, no temp files;
+        # upload_fileobj still switches to multipart for large objects
         if isinstance(value, pd.DataFrame):
-            with tempfile.TemporaryDirectory() as td:
-                fpath = Path(td) / f"{key}.parquet"
-                value.to_parquet(fpath, compression="snappy", index=False)
-                s3_key = self._key(trace_id, key, ".parquet")
-                self.s3.upload_file(str(fpath), self.bucket, s3_key, ExtraArgs=self._extra_args())
-                try:
-                    from app.services.costs import add_io
-                    add_io(trace_id, bytes_written=fpath.stat().st_size, objects_written=1)
-                except Exception:
-                    pass
-                return {"backend": self.name, "dtype": "DataFrame", "key": s3_key}
+            buf = io.BytesIO()
+            value.to_parquet(buf, engine="pyarrow", index=False, **self._write_options)
+            data, ext, dtype = buf.getvalue(), ".parquet", "DataFrame"
+        else:
+            # Plain values go up as JSON, anything else pickled via pandas
+            data, ext = dump_object(value)
+            dtype = type(value).__name__
+        s3_key = self._key(trace_id, key, ext)
+        self.s3.upload_fileobj(io.BytesIO(data), self.bucket, s3_key, ExtraArgs=self._upload_args, Config=self._transfer)
+        try:
+            from app.services.costs import add_io
+            add_io(trace_id, bytes_written=len(data), objects_written=1)
+        except Exception:
+            pass
+        self._exts.setdefault(trace_id, {})[key] = ext
+        return {"backend": self.name, "dtype": dtype, "ext": ext, "key": s3_key}
+
+    def _find_ext(self, trace_id: str, key: str) -> str | None:
+        # One listing of "<key>." finds whichever format exists, instead of
+        # a failed GET per format tried before it
+        base = self._key(trace_id, key, "")
+        resp = self.s3.list_objects_v2(Bucket=self.bucket, Prefix=base + ".")
+        found = {obj["Key"][len(base):] for obj in resp.get("Contents", [])}
+        ext = next((e for e in _EXTS if e in found), None)
+        if ext is not None:
+            self._exts.setdefault(trace_id, {})[key] = ext
+        return ext
+
+    def _download(self, trace_id: str, key: str, ext: str) -> io.BytesIO | None:
+        buf = io.BytesIO()
+        try:
+            self.s3.download_fileobj(self.bucket, self._key(trace_id, key, ext), buf, Config=self._transfer)
+        except ClientError as e:
+            if not _is_missing(e):
+                raise
+            self._exts.get(trace_id, {}).pop(key, None)
+            return None
+        buf.seek(0)
+        return buf
+
+    def get(self, trace_id: str, key: str, *, columns: List[str] | None = None, ext: str | None = None) -> Any:
+        if ext is not None:
+            # The caller has the format from put(), so a miss is a miss
+            buf = self._download(trace_id, key, probe_exts(ext, _EXTS)[0])
+            if buf is None:
+                return None
         else:
-            # For simplicity, serialize non-DF as pickle via pandas
-            with tempfile.TemporaryDirectory() as td:
-                fpath = Path(td) / f"{key}.pkl"
-                value.to_pickle(fpath) if hasattr(value, "to_pickle") else pd.Series([value]).to_pickle(fpath)
-                s3_key = self._key(trace_id, key, ".pkl")
-                self.s3.upload_file(str(fpath), self.bucket, s3_key, ExtraArgs=self._extra_args())
-                try:
-                    from app.services.costs import add_io
-                    add_io(trace_id, bytes_written=fpath.stat().st_size, objects_written=1)
-                except Exception:
-                    pass
-                return {"backend": self.name, "dtype": type(value).__name__, "key": s3_key}
-
-    def get(self, trace_id: str, key: str) -> Any:
-        # Try parquet, then pickle
-        for ext, reader in ((".parquet", pd.read_parquet), (".pkl", pd.read_pickle)):
-            s3_key = self._key(trace_id, key, ext)
-            try:
-                with tempfile.TemporaryDirectory() as td:
-                    fpath = Path(td) / f"{key}{ext}"
-                    self.s3.download_file(self.bucket, s3_key, str(fpath))
-                    try:
-                        from app.services.costs import add_io
-                        add_io(trace_id, bytes_read=Path(fpath).stat().st_size, objects_read=1)
-                    except Exception:
-                        pass
-                    return reader(fpath)
-            except Exception:
-                continue
-        return None
+            ext = self._exts.get(trace_id, {}).get(key)
+            buf = self._download(trace_id, key, ext) if ext is not None else None
+        if buf is None:
+            # Not seen by this process, or deleted or rewritten in another
+            # format by another one since
+            ext = self._find_ext(trace_id, key)
+            buf = self._download(trace_id, key, ext) if ext is not None else None
+            if buf is None:
+                return None
+        try:
+            from app.services.costs import add_io
+            add_io(trace_id, bytes_read=buf.getbuffer().nbytes, objects_read=1)
+        except Exception:
+            pass
+        if ext == ".parquet":
+            return pd.read_parquet(buf, columns=columns)
+        return read_json(buf) if ext == ".json" else read_pickle(buf)
 
     def delete(self, trace_id: str, key: str) -> None:
-        for ext in (".parquet", ".pkl"):
-            s3_key = self._key(trace_id, key, ext)
-            try:
-                self.s3.delete_object(Bucket=self.bucket, Key=s3_key)
-            except Exception:
-                pass
+        self._exts.get(trace_id, {}).pop(key, None)
+        # Every format in one batch request; missing keys count as deleted,
+        # so nothing needs to be looked up first
+        resp = self.s3.delete_objects(
+            Bucket=self.bucket,
+            Delete={"Objects": [{"Key": self._key(trace_id, key, ext)} for ext in _EXTS], "Quiet": True},
+        )
+        errors = resp.get("Errors", [])
+        if errors:
+            logger.warning(f"Failed to delete {key} under trace {trace_id}: {errors[0]}")
+            raise RuntimeError(f"Failed to delete {len(errors)} objects for {key}")
 
     def clear(self, trace_id: str) -> None:
         paginator = self.s3.get_paginator('list_objects_v2')
-        prefix = f"{self.prefix}/{trace_id}/"
-        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
-            for obj in page.get('Contents', []) or []:
-                try:
-                    self.s3.delete_object(Bucket=self.bucket, Key=obj['Key'])
-                except Exception:
-                    pass
+        prefix = self._trace_prefixes.pop(trace_id, None) or self._key_prefix + trace_id + "/"
+        self._exts.pop(trace_id, None)
+        # A listed page holds at most 1000 keys, the delete_objects limit, so
+        # each page is one batch request; batches overlap on threads sharing
+        # the (thread-safe) client while listing continues
+        with ThreadPoolExecutor(max_workers=_DELETE_WORKERS) as pool:
+            futures = []
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+                objects = [{"Key": obj["Key"]} for obj in page.get('Contents', []) or []]
+                if objects:
+                    futures.append(pool.submit(
+                        self.s3.delete_objects,
+                        Bucket=self.bucket,
+                        Delete={"Objects": objects, "Quiet": True},
+                    ))
+            # Quiet mode reports only the keys that failed
+            errors = [err for future in as_completed(futures) for err in future.result().get("Errors", [])]
+        if errors:
+            logger.warning(f"Failed to delete {len(errors)} objects under {prefix}: {errors[0]}")
+            raise RuntimeError(f"Failed to delete {len(errors)} objects under {prefix}")
@@ -24,6 +24,11 @@ class BacktestError(StrategyLabException):
     pass
 
 
+class BacktestPruned(BacktestError):
+    """Backtest abandoned early because it cannot reach the required score"""
+    pass
+
+
 class InsufficientDataError(StrategyLabException):
     """Insufficient data for analysis"""
     pass
@@ -1,4 +1,10 @@
 from __future__ import annotations
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from app.services.ohlcv_kernels import NUMBA_AVAILABLE, ohlcv_bars
 
 _ALIASES = {
     "60m": "1h",
@@ -12,12 +18,23 @@ _ALIASES = {
     "1day": "1d",
 }
 
+# Bar column -> resampling reducer, in output column order
+_OHLCV_AGG = (
+    ("open", "first"),
+    ("high", "max"),
+    ("low", "min"),
+    ("close", "last"),
+    ("volume", "sum"),
+)
+
 
+@lru_cache(maxsize=128)
 def normalize_timeframe(tf: str) -> str:
     tf = tf.strip().lower()
     return _ALIASES.get(tf, tf)
 
 
+@lru_cache(maxsize=128)
 def to_pandas_freq(tf: str) -> str:
     tf = normalize_timeframe(tf)
     if tf.endswith("m"):
@@ -29,27 +46,73 @@ def to_pandas_freq(tf: str) -> str:
     return tf
 
 
-def resample_ohlcv(df, timeframe: str):
-    import pandas as pd
+_NS_PER_DAY = 86_400_000_000_000
+
+
+def _bin_nanos(freq: str) -> int | None:
+    # Fixed-width bins that tile a day start at multiples of their width
+    # from the epoch, the same edges resample()'s start-of-day origin gives
+    try:
+        offset = pd.tseries.frequencies.to_offset(freq)
+    except ValueError:
+        return None
+    if not isinstance(offset, pd.offsets.Tick) or _NS_PER_DAY % offset.nanos:
+        return None
+    return offset.nanos
 
+
+def _resample_compiled(idx: pd.DatetimeIndex, df, step: int):
+    # Bars of consecutive rows sharing a bin, reduced in one compiled pass;
+    # empty bins never form, which dropna() would remove anyway
+    keys = idx.asi8 // step
+    starts = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+    starts = np.concatenate(([0], starts, [len(keys)])).astype(np.int64)
+    cols = [df[col].to_numpy(dtype=np.float64) for col, _ in _OHLCV_AGG]
+    bars = dict(zip((col for col, _ in _OHLCV_AGG), ohlcv_bars(*cols, starts)))
+    if df["volume"].dtype.kind in "iu":
+        bars["volume"] = bars["volume"].astype(df["volume"].dtype)
+    labels = pd.DatetimeIndex(keys[starts[:-1]] * step, tz="UTC", name="timestamp")
+    return pd.DataFrame(bars, index=labels)
+
+
+def _constant_column(value, n: int) -> pd.Categorical:
+    # One category and int8 codes instead of n object pointers to one value
+    if pd.isna(value):
+        return pd.Categorical.from_codes(np.full(n, -1, dtype=np.int8), categories=[])
+    return pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), categories=[value])
+
+
+def resample_ohlcv(df, timeframe: str):
     if df.empty:
         return df
     freq = to_pandas_freq(timeframe)
-    x = df.copy()
-    x["timestamp"] = pd.to_datetime(x["timestamp"], utc=True)
-    x = x.set_index("timestamp")
-    agg = {
-        "open": "first",
-        "high": "max",
-        "low": "min",
-        "close": "last",
-        "volume": "sum",
-    }
-    out = x.resample(freq).agg(agg).dropna().reset_index()
-    # carry symbol/source if present
+    # Index the aggregated columns' existing arrays by time instead of
+    # copying the whole frame first; copy=False keeps them unconsolidated
+    ts = df["timestamp"]
+    # Timestamps already in ns UTC are indexed in place; to_datetime would
+    # copy them even when there is nothing to convert
+    if ts.dtype != "datetime64[ns, UTC]":
+        ts = pd.to_datetime(ts, utc=True)
+    idx = pd.DatetimeIndex(ts.array, name="timestamp", copy=False)
+    step = _bin_nanos(freq) if NUMBA_AVAILABLE else None
+    if (
+        step is not None
+        and idx.dtype == "datetime64[ns, UTC]"
+        and idx.is_monotonic_increasing
+        and all(df[col].dtype == np.float64 for col, _ in _OHLCV_AGG[:4])
+        and df["volume"].dtype.kind in "iuf"
+    ):
+        out = _resample_compiled(idx, df, step).dropna().reset_index()
+    else:
+        x = pd.DataFrame({col: df[col].to_numpy() for col, _ in _OHLCV_AGG}, index=idx, copy=False)
+        # Each column calls its compiled reducer directly on the shared bins,
+        # skipping agg()'s per-column dispatch of a spec dict
+        r = x.resample(freq)
+        out = pd.DataFrame({col: getattr(r[col], how)() for col, how in _OHLCV_AGG}).dropna().reset_index()
+    # carry symbol/source if present, as single-category columns
     if "symbol" in df.columns:
-        out["symbol"] = df["symbol"].iloc[0]
+        out["symbol"] = _constant_column(df["symbol"].iloc[0], len(out))
     if "source" in df.columns:
-        out["source"] = df["source"].iloc[0]
+        out["source"] = _constant_column(df["source"].iloc[0], len(out))
     return out
 
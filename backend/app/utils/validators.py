@@ -4,17 +4,24 @@ Validation utilities for Strategy Lab
 """
 import pandas as pd
 from datetime import datetime
-from typing import Optional
+from typing import Collection, Optional
 from app.utils.exceptions import InvalidStrategyError, InsufficientDataError
 
+# Columns every market data frame must carry; pass to validate_dataframe
+OHLCV_COLUMNS = frozenset(("Open", "High", "Low", "Close", "Volume"))
 
-def validate_dataframe(df: pd.DataFrame, required_columns: list[str]) -> None:
+# Top-level keys of a strategy config, in the order errors report them
+_STRATEGY_FIELDS = ("indicators", "entry_rules", "exit_rules")
+_REQUIRED_FIELDS = frozenset(_STRATEGY_FIELDS)
+
+
+def validate_dataframe(df: pd.DataFrame, required_columns: Collection[str]) -> None:
     """
     Validate that dataframe has required columns
     
     Args:
         df: DataFrame to validate
-        required_columns: List of required column names
+        required_columns: Required column names, e.g. OHLCV_COLUMNS
         
     Raises:
         InsufficientDataError: If DataFrame is empty or missing columns
@@ -22,11 +29,25 @@ def validate_dataframe(df: pd.DataFrame, required_columns: list[str]) -> None:
     if df.empty:
         raise InsufficientDataError("DataFrame is empty")
     
-    missing_columns = set(required_columns) - set(df.columns)
+    # Look each required name up in the column index's hash table instead of
+    # building a set of every column, which is wide once indicators are added
+    missing_columns = {col for col in required_columns if col not in df.columns}
     if missing_columns:
         raise InsufficientDataError(f"Missing required columns: {missing_columns}")
 
 
+def _parse_date(value: str) -> datetime:
+    # fromisoformat is C-implemented, strptime walks its format each call;
+    # only plain YYYY-MM-DD takes the fast path since 3.11's fromisoformat
+    # also accepts week dates, times and offsets that strptime rejects
+    if len(value) == 10 and value[4] == value[7] == "-":
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
 def validate_date_range(start_date: str, end_date: Optional[str] = None) -> tuple[datetime, datetime]:
     """
     Validate and parse date range
@@ -42,13 +63,13 @@ def validate_date_range(start_date: str, end_date: Optional[str] = None) -> tupl
         ValueError: If dates are invalid
     """
     try:
-        start = datetime.strptime(start_date, "%Y-%m-%d")
+        start = _parse_date(start_date)
     except ValueError:
         raise ValueError(f"Invalid start_date format: {start_date}. Use YYYY-MM-DD")
     
     if end_date:
         try:
-            end = datetime.strptime(end_date, "%Y-%m-%d")
+            end = _parse_date(end_date)
         except ValueError:
             raise ValueError(f"Invalid end_date format: {end_date}. Use YYYY-MM-DD")
     else:
@@ -70,14 +91,13 @@ def validate_strategy_config(config: dict) -> None:
     Raises:
         InvalidStrategyError: If configuration is invalid
     """
-    required_fields = ["indicators", "entry_rules", "exit_rules"]
-    
-    for field in required_fields:
-        if field not in config:
-            raise InvalidStrategyError(f"Missing required field: {field}")
+    if not _REQUIRED_FIELDS.issubset(config):
+        missing = [field for field in _STRATEGY_FIELDS if field not in config]
+        raise InvalidStrategyError(f"Missing required field: {', '.join(missing)}")
     
-    if not isinstance(config["indicators"], list):
+    indicators = config["indicators"]
+    if not isinstance(indicators, list):
         raise InvalidStrategyError("'indicators' must be a list")
     
-    if len(config["indicators"]) == 0:
+    if not indicators:
         raise InvalidStrategyError("At least one indicator is required")
@@ -12,6 +12,13 @@ print("=" * 60)
 print("STRATEGY LAB BACKEND - QUICK TEST")
 print("=" * 60)
 
+# Sample data shared by the tests below: one block of draws and its random
+# walks, generated once. Rows feed Open/High/Low/Close, row 0 doubles as the
+# indicator price series and the daily returns
+rng = np.random.default_rng(42)
+noise = rng.standard_normal((4, 252))
+walks = np.cumsum(noise[:, :250] * 2, axis=1)
+
 # Test 1: Technical Indicators
 print("\n[TEST 1] Testing Technical Indicators...")
 try:
@@ -19,8 +26,7 @@ try:
     
     # Create sample data
     dates = pd.date_range(start='2020-01-01', periods=100, freq='D')
-    np.random.seed(42)
-    prices = pd.Series(100 + np.cumsum(np.random.randn(100) * 2), index=dates)
+    prices = pd.Series(100 + walks[0, :100], index=dates)
     
     indicators = TechnicalIndicators()
     
@@ -63,8 +69,7 @@ try:
     from app.services.metrics import PerformanceMetrics
     
     # Create sample returns
-    np.random.seed(42)
-    returns = pd.Series(np.random.randn(252) * 0.01)  # Daily returns
+    returns = pd.Series(noise[0] * 0.01)  # Daily returns
     
     metrics_calc = PerformanceMetrics(risk_free_rate=0.02, periods_per_year=252)
     
@@ -100,14 +105,13 @@ try:
     
     # Create sample market data
     dates = pd.date_range(start='2020-01-01', periods=250, freq='D')
-    np.random.seed(42)
     
     df = pd.DataFrame({
-        'Open': 100 + np.cumsum(np.random.randn(250) * 2),
-        'High': 102 + np.cumsum(np.random.randn(250) * 2),
-        'Low': 98 + np.cumsum(np.random.randn(250) * 2),
-        'Close': 100 + np.cumsum(np.random.randn(250) * 2),
-        'Volume': np.random.randint(1000000, 5000000, 250)
+        'Open': 100 + walks[0],
+        'High': 102 + walks[1],
+        'Low': 98 + walks[2],
+        'Close': 100 + walks[3],
+        'Volume': rng.integers(1000000, 5000000, 250)
     }, index=dates)
     
     # Create simple strategy config
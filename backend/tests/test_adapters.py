@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import types
 
@@ -24,7 +25,7 @@ def test_yahoo_adapter_mock(monkeypatch):
 
     class Dummy:
         def download(self, symbol, start=None, end=None, interval=None, progress=False):
-            idx = pd.to_datetime(["2024-01-01T00:00:00Z", "2024-01-02T00:00:00Z"], utc=True)
+            idx = pd.DatetimeIndex(np.array(["2024-01-01T00:00:00", "2024-01-02T00:00:00"], dtype="datetime64[ns]"), tz="UTC")
             return pd.DataFrame({
                 "Open": [1.0, 1.1],
                 "High": [1.2, 1.3],
@@ -2,56 +2,96 @@
 """
 API endpoint tests
 """
+import httpx
 import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
 from app.main import app
 from app.core.database import Base, get_db
 
-# Test database
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Test database: in memory, one shared connection, schema created once
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+
+
+# pysqlite's own transaction handling breaks SAVEPOINT; let SQLAlchemy
+# emit BEGIN itself
+@event.listens_for(engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(engine, "begin")
+def _begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
+Base.metadata.create_all(bind=engine)
+
+# Connection of the running test, holding the transaction rolled back after it
+_connection = None
+
 
 # Override database dependency
 def override_get_db():
+    # Commits inside a request release a savepoint; the outer transaction
+    # stays open until the test ends
+    db = Session(bind=_connection, autoflush=False, join_transaction_mode="create_savepoint")
     try:
-        db = TestingSessionLocal()
         yield db
     finally:
         db.close()
 
 app.dependency_overrides[get_db] = override_get_db
 
-# Create test client
-client = TestClient(app)
+# Every test is a coroutine run by anyio's pytest plugin
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(scope="module")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="module")
+async def client(anyio_backend):
+    """One keep-alive client for the module, calling the app in-process"""
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+        yield c
 
 
 @pytest.fixture(autouse=True)
 def setup_database():
-    """Setup and teardown test database"""
-    Base.metadata.create_all(bind=engine)
+    """Run each test in a transaction that is rolled back afterwards"""
+    global _connection
+    _connection = engine.connect()
+    transaction = _connection.begin()
     yield
-    Base.metadata.drop_all(bind=engine)
+    transaction.rollback()
+    _connection.close()
 
 
-def test_root_endpoint():
+async def test_root_endpoint(client):
     """Test root endpoint"""
-    response = client.get("/")
+    response = await client.get("/")
     assert response.status_code == 200
     assert "name" in response.json()
     assert "version" in response.json()
 
 
-def test_health_check():
+async def test_health_check(client):
     """Test health check endpoint"""
-    response = client.get("/health")
+    response = await client.get("/health")
     assert response.status_code == 200
     assert response.json()["status"] == "healthy"
 
 
-def test_create_strategy():
+async def test_create_strategy(client):
     """Test strategy creation"""
     strategy_data = {
         "name": "Test SMA Crossover",
@@ -72,13 +112,13 @@ def test_create_strategy():
         "tags": ["test", "sma"]
     }
     
-    response = client.post("/api/v1/strategies/", json=strategy_data)
+    response = await client.post("/api/v1/strategies/", json=strategy_data)
     assert response.status_code == 201
     assert response.json()["name"] == "Test SMA Crossover"
     assert response.json()["id"] is not None
 
 
-def test_list_strategies():
+async def test_list_strategies(client):
     """Test listing strategies"""
     # Create a strategy first
     strategy_data = {
@@ -89,15 +129,15 @@ def test_list_strategies():
             "exit_rules": {"condition": "SMA_20 < Close"}
         }
     }
-    client.post("/api/v1/strategies/", json=strategy_data)
+    await client.post("/api/v1/strategies/", json=strategy_data)
     
     # List strategies
-    response = client.get("/api/v1/strategies/")
+    response = await client.get("/api/v1/strategies/")
     assert response.status_code == 200
     assert response.json()["total"] >= 1
 
 
-def test_get_strategy():
+async def test_get_strategy(client):
     """Test getting a specific strategy"""
     # Create a strategy
     strategy_data = {
@@ -108,16 +148,16 @@ def test_get_strategy():
             "exit_rules": {"condition": "SMA_20 < Close"}
         }
     }
-    create_response = client.post("/api/v1/strategies/", json=strategy_data)
+    create_response = await client.post("/api/v1/strategies/", json=strategy_data)
     strategy_id = create_response.json()["id"]
     
     # Get strategy
-    response = client.get(f"/api/v1/strategies/{strategy_id}")
+    response = await client.get(f"/api/v1/strategies/{strategy_id}")
     assert response.status_code == 200
     assert response.json()["id"] == strategy_id
 
 
-def test_update_strategy():
+async def test_update_strategy(client):
     """Test updating a strategy"""
     # Create a strategy
     strategy_data = {
@@ -128,17 +168,17 @@ def test_update_strategy():
             "exit_rules": {"condition": "SMA_20 < Close"}
         }
     }
-    create_response = client.post("/api/v1/strategies/", json=strategy_data)
+    create_response = await client.post("/api/v1/strategies/", json=strategy_data)
     strategy_id = create_response.json()["id"]
     
     # Update strategy
     update_data = {"name": "Updated Name"}
-    response = client.put(f"/api/v1/strategies/{strategy_id}", json=update_data)
+    response = await client.put(f"/api/v1/strategies/{strategy_id}", json=update_data)
     assert response.status_code == 200
     assert response.json()["name"] == "Updated Name"
 
 
-def test_delete_strategy():
+async def test_delete_strategy(client):
     """Test deleting a strategy"""
     # Create a strategy
     strategy_data = {
@@ -149,13 +189,13 @@ def test_delete_strategy():
             "exit_rules": {"condition": "SMA_20 < Close"}
         }
     }
-    create_response = client.post("/api/v1/strategies/", json=strategy_data)
+    create_response = await client.post("/api/v1/strategies/", json=strategy_data)
     strategy_id = create_response.json()["id"]
     
     # Delete strategy
-    response = client.delete(f"/api/v1/strategies/{strategy_id}")
+    response = await client.delete(f"/api/v1/strategies/{strategy_id}")
     assert response.status_code == 204
     
     # Verify deletion
-    get_response = client.get(f"/api/v1/strategies/{strategy_id}")
+    get_response = await client.get(f"/api/v1/strategies/{strategy_id}")
     assert get_response.status_code == 404
@@ -0,0 +1,59 @@
+"""
+Backtester tests
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import backtester
+from app.services.backtester import cross_over, cross_under
+
+
+@pytest.fixture(params=[True, False], ids=['numba', 'numpy'])
+def kernels(request, monkeypatch):
+    """Run with the compiled crossing kernel and with its numpy fallback"""
+    if request.param and not backtester.NUMBA_AVAILABLE:
+        pytest.skip("numba not installed")
+    monkeypatch.setattr(backtester, 'NUMBA_AVAILABLE', request.param)
+
+
+@pytest.fixture
+def lines():
+    """Two oscillating series with NaN warm-up bars of different lengths"""
+    index = pd.date_range('2020-01-01', periods=300, freq='D')
+    rng = np.random.default_rng(7)
+    fast = pd.Series(rng.standard_normal(300).cumsum(), index=index)
+    slow = fast.rolling(10).mean()
+    fast.iloc[:3] = np.nan
+    # Exact ties exercise the <= / >= side of the comparison
+    slow.iloc[50:55] = fast.iloc[50:55]
+    return fast, slow
+
+
+def test_crossings_match_shift_form(kernels, lines):
+    """Test cross_over/cross_under agree with the shift(1) expressions"""
+    a, b = lines
+    
+    pd.testing.assert_series_equal(cross_over(a, b), (a > b) & (a.shift(1) <= b.shift(1)))
+    pd.testing.assert_series_equal(cross_under(a, b), (a < b) & (a.shift(1) >= b.shift(1)))
+
+
+def test_crossings_against_number(kernels, lines):
+    """Test a number on either side matches the shift(1) expressions"""
+    a, _ = lines
+    
+    pd.testing.assert_series_equal(cross_over(a, 0.5), (a > 0.5) & (a.shift(1) <= 0.5))
+    pd.testing.assert_series_equal(cross_under(0.5, a), (0.5 < a) & (0.5 >= a.shift(1)))
+
+
+def test_crossings_need_a_series():
+    """Test two numbers are rejected with a clear error"""
+    with pytest.raises(TypeError):
+        cross_over(1.0, 2.0)
+
+
+def test_crossings_of_misaligned_series_behave_like_pandas(lines):
+    """Test differently labeled Series are not compared by position"""
+    a, b = lines
+    with pytest.raises(ValueError):
+        cross_over(a, b.iloc[1:])
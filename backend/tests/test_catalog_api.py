@@ -1,13 +1,24 @@
-from fastapi.testclient import TestClient
+import httpx
+import pytest
 from app.main import app
 
 
-client = TestClient(app)
+pytestmark = pytest.mark.anyio
 
 
-def test_catalog_list_empty_ok():
-    r = client.get("/api/v1/catalog/datasets")
+@pytest.fixture(scope="module")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="module")
+async def client(anyio_backend):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+        yield c
+
+
+async def test_catalog_list_empty_ok(client):
+    r = await client.get("/api/v1/catalog/datasets")
     assert r.status_code == 200
     body = r.json()
     assert "items" in body and "count" in body
-
@@ -0,0 +1,18 @@
+"""
+Cost tracker tests
+"""
+from app.services import costs
+
+
+def test_pop_stale_yields_each_trace_once(monkeypatch):
+    """Test touches sharing one clock value don't repeat a stale trace"""
+    monkeypatch.setattr(costs, "_costs", {})
+    monkeypatch.setattr(costs, "_costs_index", [])
+    monkeypatch.setattr(costs.time, "time", lambda: 1000.0)
+    
+    costs.add_io("A", bytes_written=10)
+    costs.add_compute("A", 5)
+    costs.add_io("B", bytes_read=1)
+    
+    assert sorted(costs.pop_stale(2000.0)) == ["A", "B"]
+    assert costs.pop_stale(2000.0) == []
@@ -45,6 +45,18 @@ def test_rsi_calculation(sample_data):
     assert (rsi.dropna() >= 0).all() and (rsi.dropna() <= 100).all()
 
 
+def test_rsi_matches_wilder_ewm(sample_data):
+    """Test RSI agrees with the reference pandas Wilder smoothing"""
+    delta = sample_data.diff()
+    avg_gains = delta.where(delta > 0, 0.0).ewm(alpha=1/14, min_periods=14, adjust=False).mean()
+    avg_losses = (-delta.where(delta < 0, 0.0)).ewm(alpha=1/14, min_periods=14, adjust=False).mean()
+    expected = (100 - (100 / (1 + avg_gains / avg_losses))).fillna(100)
+    
+    rsi = TechnicalIndicators.rsi(sample_data, period=14)
+    
+    np.testing.assert_allclose(rsi.to_numpy(), expected.to_numpy(), rtol=1e-10)
+
+
 def test_macd_calculation(sample_data):
     """Test MACD calculation"""
     macd_line, signal_line, histogram = TechnicalIndicators.macd(sample_data)
@@ -69,6 +81,20 @@ def test_bollinger_bands_calculation(sample_data):
     assert (middle[valid_data] >= lower[valid_data]).all()
 
 
+def test_bollinger_std_on_long_trending_series():
+    """Test the rolling std keeps its precision on long trending series"""
+    rng = np.random.default_rng(0)
+    prices = pd.Series(100 + np.cumsum(rng.standard_normal(200_000) * 0.1 + 0.05))
+    
+    upper, middle, _ = TechnicalIndicators.bollinger_bands(prices, period=20, num_std=1)
+    std = (upper - middle).to_numpy()
+    
+    np.testing.assert_allclose(std[19:], prices.rolling(20).std().to_numpy()[19:], rtol=2e-4)
+    # pandas drifts too on this series, so also check windows exactly
+    for i in (19, 99_999, 199_999):
+        assert std[i] == pytest.approx(np.std(prices.to_numpy()[i - 19:i + 1], ddof=1), rel=1e-7)
+
+
 def test_insufficient_data_error():
     """Test that insufficient data raises error"""
     short_data = pd.Series([1, 2, 3, 4, 5])
@@ -95,3 +121,30 @@ def test_calculate_all_indicators():
     assert 'RSI_14' in result.columns
     assert 'MACD_Line' in result.columns
     assert 'BB_Upper' in result.columns
+
+
+def test_ema_append_reuses_previous_state(sample_data):
+    """Test EMA extended over appended bars matches a full recomputation"""
+    from app.services.indicators import clear_indicator_cache
+    
+    clear_indicator_cache()
+    TechnicalIndicators.ema(sample_data.iloc[:80], period=20)
+    extended = TechnicalIndicators.ema(sample_data, period=20)
+    expected = sample_data.ewm(span=20, adjust=False, min_periods=20).mean()
+    
+    np.testing.assert_allclose(extended.to_numpy(), expected.to_numpy(), rtol=1e-12)
+    assert extended.index.equals(sample_data.index)
+
+
+def test_calculate_all_indicators_float32():
+    """Test float32 indicators agree with the float64 results"""
+    dates = pd.date_range(start='2020-01-01', periods=1000, freq='D')
+    np.random.seed(7)
+    df = pd.DataFrame({'Close': 100 + np.cumsum(np.random.randn(1000))}, index=dates)
+    
+    full = TechnicalIndicators.calculate_all_indicators(df)
+    half = TechnicalIndicators.calculate_all_indicators(df, dtype=np.float32)
+    
+    assert (half['RSI_14'].dtype == np.float32) and (half['SMA_200'].dtype == np.float32)
+    for col in ['SMA_20', 'SMA_200', 'EMA_50', 'RSI_14', 'BB_Upper', 'BB_Lower']:
+        np.testing.assert_allclose(half[col], full[col], rtol=1e-6)
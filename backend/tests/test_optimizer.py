@@ -0,0 +1,103 @@
+"""
+Strategy optimizer tests
+"""
+import numpy as np
+import pandas as pd
+
+from app.services.optimizer import _HALVING_MIN_TRADES, StrategyOptimizer, _PreparedMarket
+from app.services.prebuilt_strategies import PrebuiltStrategies
+
+
+def test_optimization_stats_match_numpy():
+    """Test summary statistics agree with numpy's reductions"""
+    values = np.array([1.0, 4.0, 3.0, 2.0, 5.0, -1.0])
+    stats = StrategyOptimizer()._calculate_optimization_stats(values)
+    
+    assert stats['mean'] == np.mean(values)
+    assert stats['median'] == np.median(values)
+    assert stats['std'] == np.std(values)
+    assert stats['min'] == values.min()
+    assert stats['max'] == values.max()
+
+
+def test_optimization_stats_propagate_nan():
+    """Test a NaN metric makes every statistic NaN, median included"""
+    stats = StrategyOptimizer()._calculate_optimization_stats(np.array([1.0, np.nan, 3.0, 2.0, 5.0]))
+    
+    assert all(np.isnan(v) for v in stats.values())
+
+
+def _market(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.standard_normal(n))
+    return pd.DataFrame(
+        {'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close, 'Volume': 1e6},
+        index=pd.date_range('2020-01-01', periods=n, freq='D')
+    )
+
+
+def test_successive_halving_keeps_top_n_and_unjudged(monkeypatch):
+    """Test halving never drops below top_n or drops candidates it could not judge"""
+    optimizer = StrategyOptimizer(seed=0)
+    combos = [{'i': i} for i in range(40)]
+    # Every 4th candidate fails and every 4th + 1 trades too rarely to judge
+    unjudged = {i for i in range(40) if i % 4 in (0, 1)}
+    
+    def fake_backtests(strategy_config, param_combinations, candidates, market, prune=None):
+        return {
+            i: None if i % 4 == 0 else {
+                'metrics': {'sharpe_ratio': float(i)},
+                'num_trades': _HALVING_MIN_TRADES - 1 if i % 4 == 1 else _HALVING_MIN_TRADES
+            }
+            for i in candidates
+        }, set()
+    
+    monkeypatch.setattr(optimizer, '_backtest_combinations', fake_backtests)
+    survivors = optimizer._successive_halving({}, combos, _PreparedMarket.from_frame(_market()), 'sharpe_ratio', 5)
+    
+    assert unjudged <= set(survivors)
+    judged = sorted(set(survivors) - unjudged)
+    assert len(judged) >= 5
+    # The best judged candidates are the ones kept
+    assert judged == sorted(i for i in range(40) if i not in unjudged)[-len(judged):]
+
+
+def test_successive_halving_counts_eliminated_candidates():
+    """Test candidates dropped by halving still count as tested"""
+    strategy = PrebuiltStrategies.get_by_name('MACD Momentum')
+    market = _market()
+    
+    full = StrategyOptimizer(seed=1).optimize_strategy(strategy, market, max_iterations=40)
+    halved = StrategyOptimizer(seed=1).optimize_strategy(
+        strategy, market, max_iterations=40, successive_halving=True
+    )
+    
+    assert halved['success']
+    assert halved['eliminated'] > 0
+    assert halved['total_tested'] == full['total_tested']
+    assert len(halved['top_strategies']) == 5
+
+
+def test_pruning_with_large_margin_keeps_top_n():
+    """Test a pruned sweep with a loose margin ranks like an unpruned one"""
+    strategy = PrebuiltStrategies.get_by_name('MACD Momentum')
+    market = _market()
+    
+    full = StrategyOptimizer(seed=1).optimize_strategy(strategy, market, max_iterations=40)
+    pruned = StrategyOptimizer(seed=1).optimize_strategy(strategy, market, max_iterations=40, prune_margin=1e9)
+    
+    assert pruned['abandoned'] == 0
+    assert [s['parameters'] for s in pruned['top_strategies']] == [s['parameters'] for s in full['top_strategies']]
+    assert pruned['statistics'] == full['statistics']
+
+
+def test_pruning_reports_abandoned_candidates():
+    """Test abandoned backtests are reported and still count as tested"""
+    strategy = PrebuiltStrategies.get_by_name('MACD Momentum')
+    market = _market()
+    
+    full = StrategyOptimizer(seed=1).optimize_strategy(strategy, market, max_iterations=40)
+    pruned = StrategyOptimizer(seed=1).optimize_strategy(strategy, market, max_iterations=40, prune_margin=0.0)
+    
+    assert pruned['abandoned'] > 0
+    assert pruned['total_tested'] == full['total_tested']
@@ -1,41 +1,147 @@
+import asyncio
+
+import httpx
+import numpy as np
+import orjson
 import pandas as pd
-from fastapi.testclient import TestClient
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
 
+from app.core.config import get_settings
 from app.main import app
-from app.services.io.partitions import write_ohlcv_partition
+from app.services.io.partitions import read_ohlcv_range, write_ohlcv_partitions
+
+
+_CREATE_BODY = orjson.dumps({"kind": "backtest", "name": "bt"})
+# Run request with the agent id filled in per case by byte replacement
+_RUN_TEMPLATE = orjson.dumps({
+    "agent_id": "__AID__",
+    "task": {
+        "partitions": {"symbol": "BTC-USD", "start": "2024-01-01T00:00:00Z", "end": "2024-01-01T02:00:00Z"},
+        "strategy_config": {"name": "noop", "params": {}},
+    },
+})
 
 
-client = TestClient(app)
+# Partition file schema, declared once instead of inferred per write;
+# symbol lives in the partition path
+_SCHEMA = pa.schema([
+    ("timestamp", pa.timestamp("ns", "UTC")),
+    ("open", pa.float64()),
+    ("high", pa.float64()),
+    ("low", pa.float64()),
+    ("close", pa.float64()),
+    ("volume", pa.int64()),
+    ("source", pa.dictionary(pa.int32(), pa.string())),
+])
 
 
 def _mk_df():
-    df = pd.DataFrame({
-        "timestamp": pd.to_datetime(["2024-01-01T00:00:00Z", "2024-01-01T01:00:00Z"]),
-        "open": [1.0, 1.1],
-        "high": [1.2, 1.3],
-        "low": [0.9, 1.0],
-        "close": [1.05, 1.2],
-        "volume": [100, 200],
-        "symbol": ["BTC-USD", "BTC-USD"],
-        "source": ["test", "test"],
-    })
+    # Typed column arrays, so no dtype inference or list conversion; two
+    # symbols, each with two hourly bars, in (symbol, timestamp) order.
+    # Prices are one C-contiguous row-per-bar block for per-bar readers.
+    ts = np.array(["2024-01-01T00:00:00", "2024-01-01T01:00:00"] * 2, dtype="datetime64[ns]")
+    symbol = np.array(["BTC-USD"] * 2 + ["ETH-USD"] * 2)
+    prices = np.array([
+        [1.0, 1.2, 0.9, 1.05],
+        [1.1, 1.3, 1.0, 1.2],
+        [50.0, 52.0, 49.0, 51.0],
+        [51.0, 53.0, 50.0, 52.5],
+    ])
+    volume = np.array([100, 200, 300, 400], dtype=np.int64)
+    order = np.lexsort((ts, symbol))
+    df = pd.DataFrame(np.ascontiguousarray(prices[order]), columns=["open", "high", "low", "close"])
+    df.insert(0, "timestamp", pd.DatetimeIndex(ts[order], tz="UTC"))
+    df["volume"] = volume[order]
+    df["symbol"] = pd.Categorical(symbol[order])
+    df["source"] = pd.Categorical(["test"] * len(df))
     return df
 
 
-def test_backtest_with_partitions_path():
-    df = _mk_df()
-    res = write_ohlcv_partition(df)
-    # Create agent via API and run backtest with partition ref
-    r = client.post("/api/v1/agents/create", json={"kind": "backtest", "name": "bt"})
-    agent_id = r.json()["agent_id"]
-    task = {
-        "agent_id": agent_id,
-        "task": {
-            "partitions": {"symbol": "BTC-USD", "start": "2024-01-01T00:00:00Z", "end": "2024-01-01T02:00:00Z"},
-            "strategy_config": {"name": "noop", "params": {}},
-        },
-    }
-    resp = client.post("/api/v1/agents/run", json=task)
-    assert resp.status_code == 200
-    body = resp.json()
-    assert body["agent_id"] == agent_id
+# Partition refs by (frame fingerprint, store root); tests never modify the
+# written files, so nothing needs invalidating within a session
+_PART_CACHE = {}
+
+
+def _cached_write(df):
+    base = get_settings().LOCAL_STORAGE_BASE
+    k = (int(pd.util.hash_pandas_object(df, index=True).sum()), base)
+    if k not in _PART_CACHE:
+        _PART_CACHE[k] = write_ohlcv_partitions(df, base=base, schema=_SCHEMA)
+    return _PART_CACHE[k]
+
+
+# Partitions written by this module go under pytest's temp directory rather
+# than the configured store; pass --basetemp on a tmpfs to keep them in memory
+@pytest.fixture(scope="module", autouse=True)
+def partition_root(tmp_path_factory):
+    root = tmp_path_factory.mktemp("parts")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(get_settings(), "LOCAL_STORAGE_BASE", str(root))
+        yield root
+
+
+# Built and written once per module; tests must not modify the frame
+@pytest.fixture(scope="module")
+def ohlcv_df():
+    return _mk_df()
+
+
+@pytest.fixture(scope="module")
+def partition_ref(ohlcv_df, partition_root):
+    return _cached_write(ohlcv_df)
+
+
+@pytest.fixture(scope="module")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="module")
+async def client(anyio_backend):
+    # Bodies are posted as pre-serialized bytes with this header
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://test",
+        headers={"content-type": "application/json"},
+    ) as c:
+        yield c
+
+
+async def _run_case(client, create_request):
+    r = await client.send(create_request)
+    agent_id = orjson.loads(r.content)["agent_id"]
+    body = _RUN_TEMPLATE.replace(b"__AID__", agent_id.encode())
+    return agent_id, await client.post("/api/v1/agents/run", content=body)
+
+
+@pytest.mark.anyio
+async def test_backtest_with_partitions_path(partition_ref, client):
+    # Independent create+run pairs, each on its own agent, overlapped on
+    # one event loop; the create request is built once and resent
+    create_request = client.build_request("POST", "/api/v1/agents/create", content=_CREATE_BODY)
+    results = await asyncio.gather(*(_run_case(client, create_request) for _ in range(4)))
+    for agent_id, resp in results:
+        assert resp.status_code == 200
+        # The id is a UUID, so a byte match can't false-positive; no full parse
+        assert b'"agent_id":"' + agent_id.encode() + b'"' in resp.content
+
+
+def test_read_ohlcv_range_filters_by_time(ohlcv_df, tmp_path):
+    res = write_ohlcv_partitions(ohlcv_df, base=str(tmp_path), schema=_SCHEMA)
+    assert res["written"] == 2
+    out = read_ohlcv_range("BTC-USD", "2024-01-01T00:30:00Z", "2024-01-01T02:00:00Z", base=str(tmp_path))
+    assert len(out) == 1
+    assert out["close"].iloc[0] == 1.2
+    assert out["symbol"].iloc[0] == "BTC-USD"
+    assert read_ohlcv_range("BTC-USD", "2023-01-01", "2023-01-02", base=str(tmp_path)).empty
+    eth = read_ohlcv_range("ETH-USD", "2024-01-01T00:00:00Z", "2024-01-01T02:00:00Z", base=str(tmp_path))
+    assert eth["close"].tolist() == [51.0, 52.5]
+
+
+def test_categorical_source_stays_dictionary_encoded(partition_ref):
+    f = pq.ParquetFile(partition_ref["partitions"][0])
+    assert pa.types.is_dictionary(f.schema_arrow.field("source").type)
+    col = f.schema_arrow.get_field_index("source")
+    assert "RLE_DICTIONARY" in f.metadata.row_group(0).column(col).encodings
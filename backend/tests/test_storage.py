@@ -0,0 +1,73 @@
+"""
+Storage backend tests
+"""
+import math
+
+import pandas as pd
+import pytest
+
+from app.services.storage.local_parquet import LocalParquetBackend
+
+
+@pytest.fixture
+def backend(tmp_path):
+    return LocalParquetBackend(base_path=str(tmp_path))
+
+
+@pytest.mark.parametrize("value, ext", [
+    ({"fast": 12, "slow": [26, 9], "name": "MACD"}, ".json"),
+    ((1, "a", 2.5), ".pkl"),
+    ({1: "int key"}, ".pkl"),
+    (pd.Series([3.5]), ".pkl"),
+    (pd.Series([1.0, 2.0], name="close"), ".pkl"),
+])
+def test_object_round_trip(backend, value, ext):
+    """Test non-DataFrame values come back as stored, with their type"""
+    info = backend.put("t", "k", value)
+    assert info["ext"] == ext
+    
+    for got in (backend.get("t", "k"), backend.get("t", "k", ext=ext)):
+        assert type(got) is type(value)
+        if isinstance(value, pd.Series):
+            pd.testing.assert_series_equal(got, value)
+        else:
+            assert got == value
+
+
+def test_nan_round_trip(backend):
+    """Test NaN, which JSON cannot carry strictly, round trips as a float"""
+    assert backend.put("t", "k", float("nan"))["ext"] == ".pkl"
+    got = backend.get("t", "k")
+    assert isinstance(got, float) and math.isnan(got)
+
+
+def test_dataframe_round_trip(backend):
+    """Test DataFrames are stored as Parquet and read back equal"""
+    df = pd.DataFrame({"close": [1.0, 2.0, float("nan")], "volume": [1, 2, 3]})
+    assert backend.put("t", "k", df)["ext"] == ".parquet"
+    pd.testing.assert_frame_equal(backend.get("t", "k"), df)
+
+
+def test_legacy_series_wrapper_is_unwrapped(backend, tmp_path):
+    """Test pickles written as pd.Series([value]) read back as the value"""
+    (tmp_path / "t").mkdir()
+    pd.Series([{"a": (1, 2)}]).to_pickle(tmp_path / "t" / "k.pkl")
+    
+    assert backend.get("t", "k") == {"a": (1, 2)}
+
+
+def test_json_is_probed_before_pickle(backend, tmp_path):
+    """Test get() without an ext prefers the .json file of a key"""
+    backend.put("t", "k", (1, 2))
+    (tmp_path / "t" / "k.json").write_text('{"from": "json"}')
+    
+    assert backend.get("t", "k") == {"from": "json"}
+    assert backend.get("t", "k", ext=".pkl") == (1, 2)
+
+
+def test_rewrite_as_other_type_replaces_previous_file(backend):
+    """Test a key rewritten as a pickle is not shadowed by its old .json"""
+    backend.put("t", "k", {"v": 1})
+    backend.put("t", "k", (1, 2))
+    
+    assert backend.get("t", "k") == (1, 2)